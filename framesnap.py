@@ -6,10 +6,27 @@ FrameSnap – 화면 영역 녹화 & 프레임 추출기
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
 import time
 import os
+import io
+import ctypes
+import zlib
+import json
+import secrets
+import struct
+import bisect
+import argparse
+import collections
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 import numpy as np
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageDraw, features
 
 try:
     import mss
@@ -17,6 +34,8 @@ try:
 except ImportError:
     MSS_AVAILABLE = False
 
+WEBP_AVAILABLE = features.check('webp')
+
 
 # ──────────────────────────────────────────────────────────────
 # 영역 선택 오버레이
@@ -107,21 +126,22 @@ class Countdown:
 # 녹화 중 플로팅 컨트롤 바
 # ──────────────────────────────────────────────────────────────
 class FloatingControls:
-    def __init__(self, region: dict, on_stop):
+    def __init__(self, region: dict, on_stop, on_commit=None):
         self.region = region
         self.paused = False
+        self._rec_text = '⏪ BUF' if on_commit else '⏺ REC'
         self.win    = tk.Toplevel()
         self.win.overrideredirect(True)
         self.win.attributes('-topmost', True)
         self.win.configure(bg='#1a1a1a')
-        bw, bh = 340, 56
+        bw, bh = (480 if on_commit else 340), 56
         cx = region['left'] + region['width'] // 2 - bw // 2
         cy = region['top'] - bh - 8
         if cy < 0: cy = region['top'] + 8
         self.win.geometry(f'{bw}x{bh}+{cx}+{cy}')
         frame = tk.Frame(self.win, bg='#1a1a1a')
         frame.pack(fill='both', expand=True, padx=6, pady=6)
-        self.rec_lbl = tk.Label(frame, text='⏺ REC', bg='#1a1a1a', fg='red',
+        self.rec_lbl = tk.Label(frame, text=self._rec_text, bg='#1a1a1a', fg='red',
                                  font=('Consolas', 14, 'bold'))
         self.rec_lbl.pack(side='left', padx=10)
         self.btn_pause = tk.Button(frame, text='⏸ 일시정지', command=self._toggle_pause,
@@ -129,6 +149,11 @@ class FloatingControls:
                                     font=('맑은 고딕', 11, 'bold'), padx=10, pady=6,
                                     cursor='hand2', bd=0)
         self.btn_pause.pack(side='left', padx=4)
+        if on_commit:
+            tk.Button(frame, text='💾 리플레이 [F9]', command=on_commit,
+                      bg='#FFD700', fg='#0e0e14', relief='flat',
+                      font=('맑은 고딕', 11, 'bold'), padx=10, pady=6,
+                      cursor='hand2', bd=0).pack(side='left', padx=4)
         tk.Button(frame, text='⏹ 중지', command=on_stop,
                   bg='#FF4E6A', fg='white', relief='flat',
                   font=('맑은 고딕', 11, 'bold'), padx=14, pady=6,
@@ -173,7 +198,7 @@ class FloatingControls:
             self.rec_lbl.config(text='⏸ 일시중지', fg='#aaa')
         else:
             self.btn_pause.config(text='⏸ 일시정지', bg='#444', fg='white')
-            self.rec_lbl.config(text='⏺ REC', fg='red')
+            self.rec_lbl.config(text=self._rec_text, fg='red')
 
     def _drag_start(self, e): self._dx, self._dy = e.x, e.y
     def _drag_move(self, e):
@@ -192,30 +217,993 @@ class FloatingControls:
 # 녹화 엔진
 # ──────────────────────────────────────────────────────────────
 class Recorder:
-    def __init__(self, region, fps, on_frame, get_paused):
+    def __init__(self, region, fps, on_frame, get_paused, source=None):
         self.region, self.fps = region, fps
         self.on_frame, self.get_paused = on_frame, get_paused
+        self.source  = source           # None = mss, 그 외 mss.mss 와 같은 인터페이스의 클래스
         self.running = False
+        self.error   = None             # 캡처 실패 시 메시지 (App 이 보고 녹화를 멈춤)
+        self.dropped = 0
 
     def start(self):
         self.running = True
-        threading.Thread(target=self._loop, daemon=True).start()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
 
-    def stop(self): self.running = False
+    def stop(self):
+        """반환 후에는 on_frame 이 더 호출되지 않음"""
+        self.running = False
+        self._thread.join(timeout=1.0 / self.fps + 1)
 
     def _loop(self):
         interval = 1.0 / self.fps
         idx = 0
-        with mss.mss() as sct:
-            while self.running:
+        try:
+            with (self.source or mss.mss)() as sct:
+                while self.running:
+                    t0 = time.perf_counter()
+                    if not self.get_paused():
+                        raw = sct.grab(self.region)
+                        arr = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+                        self.on_frame(arr[:, :, [2,1,0]], idx)
+                        idx += 1
+                    wait = interval - (time.perf_counter() - t0)
+                    if wait > 0: time.sleep(wait)
+        except Exception as e:
+            self.error = f'{type(e).__name__}: {e}'
+
+
+# ──────────────────────────────────────────────────────────────
+# 별도 프로세스 캡처 (공유메모리 프레임 링)
+# ──────────────────────────────────────────────────────────────
+class SharedFrameRing:
+    """shared_memory 위의 고정 크기 BGRA 프레임 링.
+    슬롯마다 시퀀스 번호를 두고, 쓰는 동안은 -1 로 표시해 읽는 쪽이 덮어쓰기를 감지"""
+    SLOTS = 8
+
+    def __init__(self, height, width, slots=SLOTS, name=None):
+        self.slots = slots
+        meta = slots * 8
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=meta + slots * height * width * 4)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = name is None
+        self.seq  = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.data = np.ndarray((slots, height, width, 4), dtype=np.uint8,
+                               buffer=self.shm.buf, offset=meta)
+        if self.owner: self.seq[:] = -1
+
+    @property
+    def name(self): return self.shm.name
+
+    def write(self, seq, bgra):
+        slot = seq % self.slots
+        self.seq[slot] = -1
+        self.data[slot] = bgra
+        self.seq[slot] = seq
+
+    def read_rgb(self, seq):
+        """링 슬롯 뷰에서 바로 RGB로 변환 (복사는 채널 재배열 1회). 덮어써졌으면 None"""
+        slot = seq % self.slots
+        if self.seq[slot] != seq: return None
+        rgb = self.data[slot][:, :, [2,1,0]]
+        return rgb if self.seq[slot] == seq else None
+
+    def close(self):
+        self.seq = self.data = None     # 버퍼 뷰를 먼저 놓아야 close 가능
+        self.shm.close()
+        if self.owner: self.shm.unlink()
+
+
+def _capture_worker(shm_name, region, fps, slots, seq_queue, paused, stop, source=None):
+    """캡처 전용 프로세스 – UI 프로세스의 GIL과 무관하게 일정한 간격으로 grab"""
+    ring = SharedFrameRing(region['height'], region['width'], slots, name=shm_name)
+    interval = 1.0 / fps
+    seq = 0
+    try:
+        with (source or mss.mss)() as sct:
+            while not stop.is_set():
                 t0 = time.perf_counter()
-                if not self.get_paused():
-                    raw = sct.grab(self.region)
-                    arr = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
-                    self.on_frame(arr[:, :, [2,1,0]], idx)
-                    idx += 1
+                if not paused.is_set():
+                    raw = sct.grab(region)
+                    ring.write(seq, np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4))
+                    seq_queue.put(seq)
+                    seq += 1
                 wait = interval - (time.perf_counter() - t0)
                 if wait > 0: time.sleep(wait)
+    except Exception as e:                  # 오류 메시지(str)를 넘겨 UI 쪽에서 녹화를 멈추게 함
+        seq_queue.put(f'{type(e).__name__}: {e}')
+    finally:
+        seq_queue.put(None)
+        # 읽는 쪽이 먼저 멈췄으면 큐를 비우길 기다리지 않음. 오류로 끝날 땐 메시지가 전달되도록 기다림
+        if stop.is_set(): seq_queue.cancel_join_thread()
+        ring.close()
+
+
+class ProcessRecorder:
+    """Recorder와 같은 인터페이스. grab 루프는 별도 프로세스에서 돌고,
+    이 프로세스는 공유메모리 링에서 프레임을 꺼내 on_frame 으로 넘기기만 함"""
+
+    def __init__(self, region, fps, on_frame, get_paused, source=None, slots=SharedFrameRing.SLOTS):
+        self.region, self.fps = region, fps
+        self.on_frame, self.get_paused = on_frame, get_paused
+        self.source  = source
+        self.slots   = slots
+        self.running = False
+        self.error   = None
+        self.dropped = 0
+
+    def start(self):
+        ctx = mp.get_context('spawn')
+        self.ring    = SharedFrameRing(self.region['height'], self.region['width'], self.slots)
+        self._queue  = ctx.Queue()
+        self._paused = ctx.Event()
+        self._stop   = ctx.Event()
+        self._proc   = ctx.Process(target=_capture_worker, daemon=True,
+                                   args=(self.ring.name, dict(self.region), self.fps, self.slots,
+                                         self._queue, self._paused, self._stop, self.source))
+        self._proc.start()
+        self.running = True
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """반환 후에는 on_frame 이 더 호출되지 않음"""
+        self.running = False
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _consume(self):
+        idx = 0
+        try:
+            while self.running:             # stop() 이후엔 더 넘기지 않음
+                # 일시정지 상태를 캡처 프로세스에 전달
+                if self.get_paused(): self._paused.set()
+                else: self._paused.clear()
+                try: seq = self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self._proc.is_alive(): continue
+                    if self._proc.exitcode: self.error = f'캡처 프로세스 비정상 종료 (코드 {self._proc.exitcode})'
+                    break
+                if seq is None: break
+                if isinstance(seq, str):    # 캡처 프로세스에서 난 예외
+                    self.error = seq
+                    break
+                rgb = self.ring.read_rgb(seq)
+                if rgb is None:             # UI 쪽이 밀려서 링이 한 바퀴 돎
+                    self.dropped += 1
+                    continue
+                if not self.running: break
+                self.on_frame(rgb, idx)
+                idx += 1
+        finally:                            # on_frame 이 예외를 내도 프로세스·공유메모리는 정리
+            self.running = False
+            self._stop.set()
+            self._proc.join(timeout=2)
+            if self._proc.is_alive(): self._proc.terminate()
+            self.ring.close()
+
+
+class SyntheticScreen:
+    """mss.mss 대용 가짜 화면 – 자동화 테스트용 (그라데이션 위를 움직이는 사각형)"""
+
+    def __init__(self): self.n = 0
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+    def grab(self, region):
+        h, w = region['height'], region['width']
+        bgra = np.empty((h, w, 4), dtype=np.uint8)
+        bgra[..., 0] = (np.arange(w) * 255 // max(w - 1, 1)).astype(np.uint8)
+        bgra[..., 1] = (np.arange(h) * 255 // max(h - 1, 1)).astype(np.uint8)[:, None]
+        bgra[..., 2] = self.n * 7 % 256
+        bgra[..., 3] = 255
+        s = max(min(h, w) // 4, 1)
+        x = self.n * 5 % max(w - s, 1)
+        bgra[h//2 - s//2:h//2 + s//2, x:x + s, :3] = 255
+        self.n += 1
+        return SimpleNamespace(raw=bgra, width=w, height=h)
+
+
+# ──────────────────────────────────────────────────────────────
+# 리플레이 버퍼 (최근 N초 상시 녹화)
+# ──────────────────────────────────────────────────────────────
+class ReplayBuffer:
+    """최근 N초 프레임을 담는 고정 크기 링. 미리 잡아 둔 배열에 덮어쓰기만 하므로
+    몇 시간을 대기해도 메모리가 일정함. 보관 시간·FPS 와 무관하게 전체가 BUDGET 바이트를
+    넘지 않도록 프레임을 축소해 두고, 꺼낼 때 원래 크기로 되돌림"""
+    BUDGET = 256 * 1024 ** 2
+
+    def __init__(self, seconds, fps, budget=BUDGET):
+        self.slots  = max(1, int(seconds * fps))
+        self.budget = budget
+        self.data = None                    # 첫 프레임 크기를 보고 할당
+        self.seq  = np.full(self.slots, -1, dtype=np.int64)
+        self.next = 0
+        self.taken = -1                     # take() 로 마지막에 가져간 seq
+        self._take_lock = threading.Lock()
+
+    def push(self, rgb, idx=None):
+        """캡처 스레드에서 호출"""
+        if self.data is None:
+            h, w = self.shape = rgb.shape[:2]
+            per_frame = self.budget // self.slots
+            self.step = 1
+            while self.step < max(h, w) and -(-h // self.step) * -(-w // self.step) * 3 > per_frame:
+                self.step += 1
+            small = rgb[::self.step, ::self.step]
+            self.data = np.empty((self.slots,) + small.shape, dtype=np.uint8)
+        slot = self.next % self.slots
+        self.seq[slot]  = -1                # 쓰는 중 표시
+        self.data[slot] = rgb[::self.step, ::self.step]
+        self.seq[slot]  = self.next
+        self.next += 1
+
+    def snapshot(self, since=-1):
+        """seq > since 인 링 내용을 오래된 순으로, 녹화 영역 원래 크기로 복원해 반환 → (프레임 목록, 마지막 seq).
+        캡처를 멈추지 않으며, 복사 도중 덮어써진 슬롯은 건너뜀 (UI 밖 스레드에서 호출)"""
+        if self.data is None: return [], since
+        end, out, last = self.next, [], since
+        for seq in range(max(0, end - self.slots, since + 1), end):
+            slot = seq % self.slots
+            if self.seq[slot] != seq: continue
+            rgb = self.data[slot].copy()
+            if self.seq[slot] == seq:
+                out.append(rgb)
+                last = seq
+        if self.step > 1:                   # 세션의 다른 프레임과 크기를 맞춤
+            h, w = self.shape
+            out = [np.asarray(Image.fromarray(f).resize((w, h), Image.BILINEAR)) for f in out]
+        return out, last
+
+    def take(self):
+        """지난 take() 이후 새로 들어온 프레임만 반환 – 연달아 저장해도 구간이 겹치지 않음"""
+        with self._take_lock:
+            out, self.taken = self.snapshot(self.taken)
+        return out
+
+    @property
+    def nbytes(self): return 0 if self.data is None else self.data.nbytes
+
+
+class GlobalHotkey:
+    """Windows 전역 단축키 (RegisterHotKey) – 다른 창에 포커스가 있어도 callback 호출.
+    callback 은 전용 스레드에서 불림. Windows 가 아니면 아무 일도 하지 않음 (active=False)"""
+    WM_HOTKEY, WM_QUIT, MOD_NOREPEAT = 0x0312, 0x0012, 0x4000
+
+    def __init__(self, vk, callback):
+        self.vk, self.callback = vk, callback
+        self.active = False
+        self._tid = None
+        self._closed = False
+        if os.name == 'nt':
+            threading.Thread(target=self._loop, daemon=True).start()
+
+    def _loop(self):
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        if not user32.RegisterHotKey(None, 1, self.MOD_NOREPEAT, self.vk): return   # 다른 앱이 선점
+        self._tid = ctypes.windll.kernel32.GetCurrentThreadId()
+        self.active = not self._closed
+        msg = wintypes.MSG()
+        while self.active and user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            if msg.message == self.WM_HOTKEY: self.callback()
+        user32.UnregisterHotKey(None, 1)
+        self.active = False
+
+    def close(self):
+        self._closed = True
+        if self._tid is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._tid, self.WM_QUIT, 0, 0)
+
+
+# ──────────────────────────────────────────────────────────────
+# 활동 타임라인 인덱스 (변화 구간 / 책갈피 이동)
+# ──────────────────────────────────────────────────────────────
+class ActivityIndex:
+    """프레임별 변화량과 변화 영역 bbox 를 캡처하면서 누적하는 인덱스.
+    배열은 2배씩 늘려 가며, '변화 시작' 프레임 번호는 정렬된 채로 쌓여 이분 탐색 가능"""
+    STEP   = 8         # 비교용 축소 간격
+    THRESH = 1.0       # 평균 절대차(0~255) 가 이 이상이면 변화 프레임
+    PIXEL  = 24        # bbox 에 포함할 픽셀 차이
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.n     = 0
+            self.mag   = np.zeros(256, dtype=np.float32)
+            self.bbox  = np.zeros((256, 4), dtype=np.int32)   # x0, y0, x1, y1 (원본 좌표)
+            self.onset = np.zeros(64, dtype=np.int64)
+            self.n_onset = 0
+            self._prev = None
+
+    def add(self, rgb):
+        small = rgb[::self.STEP, ::self.STEP, 1].astype(np.int16)
+        mag, box = 0.0, (0, 0, 0, 0)
+        with self._lock:
+            if self._prev is not None and self._prev.shape == small.shape:
+                d = np.abs(small - self._prev)
+                mag = float(d.mean())
+                mask = d > self.PIXEL
+                rows, cols = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(mask.any(axis=0))
+                if rows.size:
+                    s = self.STEP
+                    box = (cols[0] * s, rows[0] * s, (cols[-1] + 1) * s, (rows[-1] + 1) * s)
+            self._prev = small
+            i = self.n
+            if i == len(self.mag):
+                self.mag  = np.concatenate([self.mag, np.zeros_like(self.mag)])
+                self.bbox = np.concatenate([self.bbox, np.zeros_like(self.bbox)])
+            self.mag[i], self.bbox[i] = mag, box
+            if mag >= self.THRESH and (i == 0 or self.mag[i-1] < self.THRESH):
+                if self.n_onset == len(self.onset):
+                    self.onset = np.concatenate([self.onset, np.zeros_like(self.onset)])
+                self.onset[self.n_onset] = i
+                self.n_onset += 1
+            self.n += 1
+
+    def next_change(self, idx):
+        o = self.onset[:self.n_onset]
+        k = int(np.searchsorted(o, idx, side='right'))
+        return int(o[k]) if k < len(o) else None
+
+    def prev_change(self, idx):
+        o = self.onset[:self.n_onset]
+        k = int(np.searchsorted(o, idx, side='left'))
+        return int(o[k-1]) if k else None
+
+    def heat(self, width, n):
+        """가로 width 칸으로 묶은 변화량 (칸별 최대, 0~1 sqrt 스케일)"""
+        n = min(n, self.n)
+        if n == 0 or width <= 0: return np.zeros(max(width, 0), dtype=np.float32)
+        col = np.maximum.reduceat(self.mag[:n], np.arange(width) * n // width)
+        top = max(float(col.max()), self.THRESH * 4)
+        return np.sqrt(np.clip(col / top, 0, 1))
+
+
+class BookmarkSet(set):
+    """정렬 목록을 함께 유지하는 책갈피 집합 – 이전/다음 책갈피를 이분 탐색으로 찾음.
+    내용이 바뀔 때마다 on_change() 호출 (타임라인 눈금 갱신 등)"""
+
+    def __init__(self, items=(), on_change=None):
+        super().__init__(items)
+        self.order = sorted(self)
+        self.on_change = on_change
+
+    def _changed(self):
+        if self.on_change: self.on_change()
+
+    def add(self, idx):
+        if idx not in self:
+            super().add(idx)
+            bisect.insort(self.order, idx)
+            self._changed()
+
+    def discard(self, idx):
+        if idx in self:
+            super().discard(idx)
+            del self.order[bisect.bisect_left(self.order, idx)]
+            self._changed()
+
+    def remove(self, idx):
+        if idx not in self: raise KeyError(idx)
+        self.discard(idx)
+
+    def pop(self):
+        idx = super().pop()
+        del self.order[bisect.bisect_left(self.order, idx)]
+        self._changed()
+        return idx
+
+    def clear(self):
+        super().clear()
+        self.order.clear()
+        self._changed()
+
+    # 여러 개를 한꺼번에 바꾸는 연산은 정렬 목록을 새로 만듦
+    def _resorting(op):
+        def method(self, *others):
+            result = op(self, *others)
+            if result is not NotImplemented:
+                self.order = sorted(self)
+                self._changed()
+            return result
+        method.__name__ = op.__name__
+        return method
+
+    update                      = _resorting(set.update)
+    difference_update           = _resorting(set.difference_update)
+    intersection_update         = _resorting(set.intersection_update)
+    symmetric_difference_update = _resorting(set.symmetric_difference_update)
+    __ior__  = _resorting(set.__ior__)
+    __isub__ = _resorting(set.__isub__)
+    __iand__ = _resorting(set.__iand__)
+    __ixor__ = _resorting(set.__ixor__)
+    del _resorting
+
+    def next_after(self, idx):
+        k = bisect.bisect_right(self.order, idx)
+        return self.order[k] if k < len(self.order) else None
+
+    def prev_before(self, idx):
+        k = bisect.bisect_left(self.order, idx)
+        return self.order[k-1] if k else None
+
+
+# ──────────────────────────────────────────────────────────────
+# 스크롤 캡처 이어붙이기 (세로로 긴 한 장)
+# ──────────────────────────────────────────────────────────────
+class PngStripWriter:
+    """가로줄 스트립 단위로 써 내려가는 PNG 인코더 – 전체 캔버스를 메모리에 올리지 않음"""
+
+    def __init__(self, path, width, height, level=6):
+        self.width, self.height = width, height
+        self.rows = 0
+        self.path = path
+        self._f = open(path, 'wb')
+        self._z = zlib.compressobj(level)
+        self._f.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, tag, data):
+        self._f.write(struct.pack('>I', len(data)) + tag)
+        self._f.write(data)
+        self._f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff))
+
+    def write(self, rgb):
+        h = rgb.shape[0]
+        rows = np.empty((h, self.width * 3 + 1), dtype=np.uint8)
+        rows[:, 0] = 0                      # 행 필터: None
+        rows[:, 1:] = rgb.reshape(h, -1)
+        data = self._z.compress(rows)
+        if data: self._chunk(b'IDAT', data)
+        self.rows += h
+
+    def close(self):
+        data = self._z.flush()
+        if data: self._chunk(b'IDAT', data)
+        self._chunk(b'IEND', b'')
+        self._f.close()
+
+    def abort(self):
+        """중단 – 반쯤 쓰인 파일은 지움"""
+        self._f.close()
+        try: os.remove(self.path)
+        except OSError: pass
+
+
+def _row_signature(rgb, bands=16):
+    """행 시그니처: G 채널을 가로 1/4 샘플링 후 bands개 띠로 나눈 평균 → (H, bands)"""
+    g = rgb[:, ::4, 1]
+    bands = max(1, min(bands, g.shape[1]))
+    per = g.shape[1] // bands
+    sums = g[:, :per * bands].reshape(g.shape[0], bands, per).sum(axis=2, dtype=np.uint32)
+    return sums / float(per)             # 밝기 단위로 맞춰 MSD 를 폭과 무관하게 비교
+
+
+def _scroll_offset(prev_sig, cur_sig, min_overlap):
+    """prev → cur 로 아래 방향 스크롤된 픽셀 수.
+    FFT 상호상관 + 누적합으로 모든 이동량의 평균제곱오차를 한 번에 계산"""
+    h, bands = prev_sig.shape
+    n = 1 << (2 * h - 1).bit_length()
+    corr = np.fft.irfft(np.fft.rfft(prev_sig, n, axis=0) *
+                        np.conj(np.fft.rfft(cur_sig, n, axis=0)), n, axis=0)[:h].sum(axis=1)
+    p_tail = np.cumsum((prev_sig ** 2).sum(axis=1)[::-1])[::-1]   # Σ prev[d:]²
+    c_head = np.cumsum((cur_sig ** 2).sum(axis=1))                # Σ cur[:k+1]²
+    overlap = h - np.arange(h)
+    msd = (p_tail + c_head[overlap - 1] - 2 * corr) / (overlap * bands)
+    msd[overlap < min_overlap] = np.inf
+    best = int(np.argmin(msd))
+    return best, float(msd[best])
+
+
+def stitch_scroll(frames, indices, path, min_overlap=0.15, level=6, max_msd=100.0, progress=None):
+    """겹치는 스크롤 프레임들을 세로로 이어붙여 PNG 한 장으로 저장.
+    최적 오프셋의 MSD 가 max_msd(밝기² 단위)를 넘는 프레임(위로 스크롤, 화면 전환 등)은 건너뜀.
+    progress(done, n): 오프셋 계산 + 기록을 합친 진행 상황.
+    반환: (사용된 프레임 수, 결과 높이, 건너뛴 프레임 수)"""
+    indices = [i for i in indices if i < len(frames)]
+    if not indices: return 0, 0, 0
+    h, w = frames[indices[0]].shape[:2]
+    if any(frames[i].shape[:2] != (h, w) for i in indices):
+        raise ValueError('크기가 다른 프레임이 섞여 있어 이어붙일 수 없습니다.\n'
+                         '같은 영역에서 녹화한 프레임만 선택하세요.')
+    min_rows = max(1, int(h * min_overlap))
+    # 1단계: 행 시그니처로 오프셋만 계산 (직전 시그니처 하나만 유지)
+    steps, skipped = [], 0
+    prev = _row_signature(frames[indices[0]])
+    for k, i in enumerate(indices[1:], 2):
+        if progress and k % 20 == 0: progress(k, 2 * len(indices))
+        cur = _row_signature(frames[i])
+        d, msd = _scroll_offset(prev, cur, min_rows)
+        if msd > max_msd:                   # 아래로 겹치는 위치를 못 찾음
+            skipped += 1
+        elif d > 0:                         # 스크롤 없는 프레임은 건너뜀
+            steps.append((i, d))
+            prev = cur
+    total = h + sum(d for _, d in steps)
+    # 2단계: 첫 프레임 + 새로 드러난 아래쪽 스트립만 차례로 기록
+    out = PngStripWriter(path, w, total, level)
+    try:
+        out.write(np.ascontiguousarray(frames[indices[0]]))
+        for k, (i, d) in enumerate(steps, 1):
+            out.write(np.ascontiguousarray(frames[i][h - d:]))
+            if progress and k % 20 == 0: progress(len(indices) + k * len(indices) // len(steps),
+                                                  2 * len(indices))
+        out.close()
+    except BaseException:
+        out.abort()
+        raise
+    return len(steps) + 1, total, skipped
+
+
+# ──────────────────────────────────────────────────────────────
+# 프레임 필터 체인 (캡처 → 저장 사이 / 내보내기 시)
+# ──────────────────────────────────────────────────────────────
+class FrameFilter:
+    """필터 기본형. apply(batch, meta): batch = (N, H, W, 3) uint8 (제자리 수정 가능),
+    meta = [(프레임 번호, 캡처 시각 또는 None), ...]"""
+    name = '필터'
+
+    def apply(self, batch, meta): return batch
+
+
+class RedactFilter(FrameFilter):
+    name = '영역 가리기'
+
+    def __init__(self, x, y, w, h, color=(0, 0, 0)):
+        self.rect, self.color = (x, y, w, h), color
+
+    def apply(self, batch, meta):
+        x, y, w, h = self.rect
+        batch[:, max(y, 0):y+h, max(x, 0):x+w] = self.color
+        return batch
+
+
+class GrayscaleFilter(FrameFilter):
+    name = '그레이스케일'
+
+    def apply(self, batch, meta):
+        g = ((batch[..., 0] * np.uint16(77) + batch[..., 1] * np.uint16(150) +
+              batch[..., 2] * np.uint16(29)) >> 8).astype(np.uint8)
+        for c in range(3): batch[..., c] = g     # 브로드캐스트 대입보다 채널별 대입이 빠름
+        return batch
+
+
+class SharpenFilter(FrameFilter):
+    name = '샤프닝'
+
+    def __init__(self, amount=1.0):
+        self.k = max(1, int(amount * 4))     # 라플라시안 가중치 (1/4 단위 정수)
+
+    def apply(self, batch, meta):
+        f = batch.astype(np.int16)
+        c = f[:, 1:-1, 1:-1]
+        acc = c * 4                             # 라플라시안 (제자리 연산으로 임시 배열 최소화)
+        acc -= f[:, :-2, 1:-1]
+        acc -= f[:, 2:, 1:-1]
+        acc -= f[:, 1:-1, :-2]
+        acc -= f[:, 1:-1, 2:]
+        acc *= self.k
+        acc >>= 2
+        acc += c
+        np.clip(acc, 0, 255, out=acc)
+        batch[:, 1:-1, 1:-1] = acc
+        return batch
+
+
+class TimestampFilter(FrameFilter):
+    name = '타임스탬프'
+
+    def apply(self, batch, meta):
+        fh, fw = batch.shape[1:3]
+        for k, (idx, t) in enumerate(meta):
+            text = f'#{idx+1}'
+            if t is not None:
+                text += time.strftime('  %Y-%m-%d %H:%M:%S', time.localtime(t)) + f'.{int(t*1000) % 1000:03d}'
+            patch = Image.new('RGB', (len(text) * 6 + 8, 15), 'black')
+            ImageDraw.Draw(patch).text((4, 2), text, fill='white')
+            arr = np.asarray(patch)[:fh, :fw]
+            batch[k, fh - arr.shape[0]:, :arr.shape[1]] = arr
+        return batch
+
+
+class FilterChain:
+    """순서 있는 필터 목록. 배치 단위로 실행하며 필터별 누적 시간과 실패한 프레임 수를 기록"""
+    BATCH = 8
+
+    def __init__(self, filters=()):
+        self.filters = list(filters)
+        self.failed  = 0                # 필터 예외로 처리하지 못한 프레임 수
+        self.last_error = None
+        self._stats  = {}
+        self._lock   = threading.Lock()
+
+    def __bool__(self): return bool(self.filters)
+
+    def run(self, frames, meta):
+        """RGB 프레임 리스트 → 필터 적용된 새 배열 리스트 (원본은 건드리지 않음)"""
+        if any(f.shape != frames[0].shape for f in frames[1:]):
+            return [out for k, rgb in enumerate(frames) for out in self.run([rgb], meta[k:k+1])]
+        batch = np.stack(frames)
+        for flt in list(self.filters):
+            t0 = time.perf_counter()
+            try:
+                batch = flt.apply(batch, meta)
+            except Exception as e:
+                with self._lock:
+                    self.failed += len(frames)
+                    self.last_error = f'{flt.name}: {type(e).__name__}: {e}'
+                raise
+            dt = time.perf_counter() - t0
+            with self._lock:
+                st = self._stats.setdefault(flt.name, [0.0, 0])
+                st[0] += dt
+                st[1] += len(frames)
+        return list(batch)
+
+    def report(self):
+        with self._lock: items, failed, err = list(self._stats.items()), self.failed, self.last_error
+        lines = [f'{name}: {sec / n * 1000:.2f} ms/프레임  ({n}프레임)' for name, (sec, n) in items if n]
+        if failed: lines.append(f'⚠️ 필터 오류로 처리 못 한 프레임 {failed}개  ({err})')
+        return '\n'.join(lines)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+            self.failed, self.last_error = 0, None
+
+
+class FilterStage:
+    """캡처 스레드와 저장 사이에서 필터 체인을 워커 풀로 실행.
+    프레임을 배치로 모아 제출하고, 결과는 입력 순서대로 sink(rgb, idx) 로 전달.
+    필터가 실패한 배치는 (가리기 필터가 빠진 원본이 저장되지 않도록) 버리고 errors 에 셈.
+    필터가 캡처를 못 따라가 대기 프레임이 max_pending 에 닿으면 새 프레임을 버리고 dropped 에 셈"""
+
+    def __init__(self, chain, sink, batch=4, max_wait=0.3, workers=2, max_pending=64):
+        self.chain, self.sink = chain, sink
+        self.batch, self.max_wait = batch, max_wait
+        self.max_pending = max_pending
+        self.errors  = 0                     # 필터 오류로 버린 프레임 수
+        self.dropped = 0                     # 대기열이 가득 차 버린 프레임 수
+        self._pending = 0                    # 받았지만 아직 sink 로 넘기지 않은 프레임 수
+        self._items  = []
+        self._closed = False
+        self._lock   = threading.Lock()
+        self._pool   = ThreadPoolExecutor(workers)
+        self._jobs   = queue.Queue()         # 제출 순서대로 쌓이는 (items, future), 끝 표시는 None
+        self._thread = threading.Thread(target=self._collect, daemon=True)
+        self._thread.start()
+
+    def push(self, rgb, idx):
+        with self._lock:
+            if self._closed: return          # 중지 뒤 늦게 도착한 프레임은 버림
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+            self._items.append((rgb, idx, time.time()))
+            if len(self._items) >= self.batch: self._submit()
+
+    def close(self):
+        """남은 프레임까지 sink 로 넘긴 뒤 반환 (워커 풀·수집 스레드 정리)"""
+        with self._lock:
+            if self._closed: return
+            self._closed = True
+            self._submit()
+            self._jobs.put(None)
+        self._thread.join()
+        self._pool.shutdown()
+
+    def _submit(self):
+        if not self._items: return
+        items, self._items = self._items, []
+        self._jobs.put((items, self._pool.submit(
+            self.chain.run, [rgb for rgb, _, _ in items], [(i, t) for _, i, t in items])))
+
+    def _collect(self):
+        while True:
+            try:
+                job = self._jobs.get(timeout=self.max_wait)
+            except queue.Empty:
+                with self._lock:
+                    # 프레임이 뜸할 때(일시정지 등) 덜 찬 배치도 오래 붙잡지 않음
+                    if self._items and time.time() - self._items[0][2] >= self.max_wait:
+                        self._submit()
+                continue
+            if job is None: break
+            items, fut = job
+            try:
+                out = fut.result()
+            except Exception:
+                self.errors += len(items)
+                out = []
+            for rgb, (_, idx, _) in zip(out, items):
+                self.sink(rgb, idx)
+            with self._lock: self._pending -= len(items)
+
+
+# ──────────────────────────────────────────────────────────────
+# 템플릿 검색 (이미지 패치가 보이는 프레임 찾기)
+# ──────────────────────────────────────────────────────────────
+def _fast_len(n):
+    """n 이상인 가장 작은 2^a·3^b·5^c (FFT 가 빠른 길이)"""
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            p = p35
+            while p < n: p *= 2
+            best = min(best, p)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _luma_blocks(rgb, step):
+    """G 채널을 step×step 블록 평균으로 축소한 float64 이미지"""
+    h, w = rgb.shape[0] // step * step, rgb.shape[1] // step * step
+    g = rgb[:h, :w, 1]
+    if step == 1: return g.astype(np.float64)
+    # 축별로 슬라이스를 더하는 편이 sum(axis=...) 보다 몇 배 빠름 (step ≤ 4 → uint16 안전)
+    x = g.reshape(h, w // step, step)
+    acc = x[:, :, 0].astype(np.uint16)
+    for k in range(1, step): acc += x[:, :, k]
+    y = acc.reshape(h // step, step, w // step)
+    out = y[:, 0].copy()
+    for k in range(1, step): out += y[:, k]
+    return out / float(step * step)
+
+
+def _lowpass(img):
+    """[1,2,1]/4 분리형 블러 (valid, 각 축 2픽셀 줄어듦)"""
+    a = img[:-2] + 2 * img[1:-1] + img[2:]
+    return (a[:, :-2] + 2 * a[:, 1:-1] + a[:, 2:]) / 16
+
+
+def _box_sums(img, h, w):
+    """모든 h×w 창의 합 (적분 영상 이용) → (H-h+1, W-w+1)"""
+    S = np.pad(img.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    return S[h:, w:] - S[:-h, w:] - S[h:, :-w] + S[:-h, :-w]
+
+
+def _ncc_map(img, tmpl, t_ss, t_fft, shape):
+    """정규화 상호상관 맵 (valid 위치만).
+    tmpl = 평균을 뺀 템플릿, t_ss = Σtmpl², t_fft = conj(rfft2(tmpl, shape))"""
+    H, W = img.shape
+    h, w = tmpl.shape
+    corr = np.fft.irfft2(np.fft.rfft2(img, shape) * t_fft, shape)[:H-h+1, :W-w+1]
+    n   = h * w
+    s1  = _box_sums(img, h, w)
+    var = _box_sums(img * img, h, w) - s1 * s1 / n
+    den = np.sqrt(np.maximum(var, 0) * t_ss)
+    return np.divide(corr, den, out=np.zeros_like(corr), where=var > n * 1e-2)   # 단색 영역은 0
+
+
+class TemplateSearch:
+    """축소 해상도 NCC 로 후보를 고르고, 후보 주변만 원본 해상도로 다시 확인.
+    패치가 프레임의 step 격자와 어긋나 있어도 점수가 떨어지지 않도록 축소 템플릿은
+    step×step 위상 전부의 블록 평균을 다시 평균하고, 축소 프레임과 함께 저역 통과시킴"""
+    CANDIDATES = 3
+
+    def __init__(self, tmpl_rgb, threshold=0.9, coarse=0.5):
+        self.threshold, self.coarse = threshold, coarse
+        self.th, self.tw = tmpl_rgb.shape[:2]
+        s = self.step = max(1, min(4, min(self.th, self.tw) // 8))
+        self.full  = self._prep(_luma_blocks(tmpl_rgb, 1))
+        if self.full[1] < 1e-6:
+            raise ValueError('단색 패치는 찾을 수 없습니다.')
+        sh, sw = (self.th - s + 1) // s, (self.tw - s + 1) // s      # 모든 위상에서 잘리지 않는 크기
+        small = sum(_luma_blocks(tmpl_rgb[py:py + sh * s, px:px + sw * s], s)
+                    for py in range(s) for px in range(s)) / (s * s)
+        self.small = self._prep(_lowpass(small) if s > 1 else small)
+        self._fft = {}
+
+    @staticmethod
+    def _prep(t):
+        t = t - t.mean()
+        return t, float((t * t).sum())
+
+    def _ncc(self, img, level):
+        tmpl, t_ss = level
+        shape = (_fast_len(img.shape[0]), _fast_len(img.shape[1]))
+        key = (level is self.full, shape)
+        if key not in self._fft:                # 같은 크기 프레임끼리는 템플릿 FFT 재사용
+            self._fft[key] = np.conj(np.fft.rfft2(tmpl, shape))
+        return _ncc_map(img, tmpl, t_ss, self._fft[key], shape)
+
+    def match(self, rgb):
+        """(점수, x, y) 또는 None"""
+        H, W = rgb.shape[:2]
+        s = self.step
+        small = _luma_blocks(rgb, s)
+        if s > 1: small = _lowpass(small)       # 템플릿과 같은 1칸 오프셋 → 후보 위치 계산은 그대로
+        sh, sw = self.small[0].shape
+        if self.th > H or self.tw > W or small.shape[0] < sh or small.shape[1] < sw:
+            return None
+        m = self._ncc(small, self.small)
+        flat = m.ravel()
+        k = min(self.CANDIDATES, flat.size)
+        best = None
+        for f in np.argpartition(flat, -k)[-k:]:
+            if flat[f] < self.coarse: continue
+            u, v = divmod(int(f), m.shape[1])
+            y0, x0 = max(0, (u - 2) * s), max(0, (v - 2) * s)
+            y1, x1 = min(H, (u + 2) * s + self.th), min(W, (v + 2) * s + self.tw)
+            fine = self._ncc(_luma_blocks(rgb[y0:y1, x0:x1], 1), self.full)
+            r, c = np.unravel_index(int(np.argmax(fine)), fine.shape)
+            score = float(fine[r, c])
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, x0 + int(c), y0 + int(r))
+        return best
+
+    def run(self, frames, indices, progress=None, cancel=None):
+        """indices 프레임을 코어 수만큼 병렬 검색 → {프레임 번호: (점수, x, y)}"""
+        indices = [i for i in indices if 0 <= i < len(frames)]
+        def job(i):
+            if cancel is not None and cancel.is_set(): return i, None
+            return i, self.match(frames[i])
+        hits = {}
+        with ThreadPoolExecutor(os.cpu_count() or 1) as pool:
+            for done, (i, m) in enumerate(pool.map(job, indices), 1):
+                if m: hits[i] = m
+                if progress and (done % 20 == 0 or done == len(indices)):
+                    progress(done, len(indices))
+        return hits
+
+
+# ──────────────────────────────────────────────────────────────
+# 내보내기 형식 (인코더 / 압축 수준)
+# ──────────────────────────────────────────────────────────────
+class ExportFormat:
+    """저장 형식 설정 → Pillow save() 인자.
+    PNG 는 compress_level(0~9) 과 zlib 전략(compress_type) 선택, WebP 는 무손실 + 노력 수준(0~6)"""
+    KINDS = {                     # 이름: (Pillow 형식, 확장자)
+        'PNG':         ('PNG',  '.png'),
+        'PNG 최적화':  ('PNG',  '.png'),
+        'WebP 무손실': ('WEBP', '.webp'),
+        'BMP 무압축':  ('BMP',  '.bmp'),
+        'PPM 무압축':  ('PPM',  '.ppm'),
+    }
+    STRATEGIES = {'기본': 0, '필터드': 1, '허프만 전용': 2, 'RLE': 3, '고정 허프만': 4}
+
+    def __init__(self, kind='PNG', level=6, strategy='기본', effort=4):
+        self.kind, self.level, self.strategy, self.effort = kind, level, strategy, effort
+
+    @property
+    def ext(self): return self.KINDS[self.kind][1]
+
+    def options(self):
+        if self.kind == 'PNG':
+            return {'compress_level': self.level, 'compress_type': self.STRATEGIES[self.strategy]}
+        if self.kind == 'PNG 최적화':
+            return {'optimize': True}
+        if self.kind == 'WebP 무손실':
+            return {'lossless': True, 'method': self.effort, 'quality': self.effort * 100 // 6}
+        return {}
+
+    def label(self):
+        if self.kind == 'PNG':         return f'PNG  레벨 {self.level} / {self.strategy}'
+        if self.kind == 'WebP 무손실': return f'WebP 무손실  노력 {self.effort}'
+        return self.kind
+
+    def save(self, img, stem):
+        """stem + 확장자 로 저장하고 경로 반환 (img = RGB 배열 또는 PIL 이미지)"""
+        if not isinstance(img, Image.Image): img = Image.fromarray(img)
+        path = stem + self.ext
+        img.save(path, self.KINDS[self.kind][0], **self.options())
+        return path
+
+
+def compare_formats(frames, sample=6):
+    """현재 녹화에서 고른 샘플 프레임으로 형식별 인코딩 시간·크기 측정
+    → [(ExportFormat, ms/프레임, 평균 바이트), ...]"""
+    if not frames: return []
+    picks = [Image.fromarray(frames[i]) for i in
+             np.linspace(0, len(frames) - 1, min(sample, len(frames))).astype(int)]
+    candidates = [ExportFormat('PNG', 1), ExportFormat('PNG', 6), ExportFormat('PNG', 9),
+                  ExportFormat('PNG', 6, 'RLE'), ExportFormat('PNG', 6, '필터드'), ExportFormat('PNG 최적화')]
+    if WEBP_AVAILABLE:
+        candidates += [ExportFormat('WebP 무손실', effort=0), ExportFormat('WebP 무손실', effort=4)]
+    candidates += [ExportFormat('BMP 무압축'), ExportFormat('PPM 무압축')]
+    results = []
+    for fmt in candidates:
+        size = 0
+        t0 = time.perf_counter()
+        for img in picks:
+            buf = io.BytesIO()
+            img.save(buf, fmt.KINDS[fmt.kind][0], **fmt.options())
+            size += buf.tell()
+        results.append((fmt, (time.perf_counter() - t0) * 1000 / len(picks), size / len(picks)))
+    return results
+
+
+# ──────────────────────────────────────────────────────────────
+# 내보내기 (프레임 / 콘택트 시트 저장)
+# ──────────────────────────────────────────────────────────────
+def save_frames(frames, indices, folder, chain=None, fmt=None):
+    """indices 프레임을 folder 에 frame_0001.png 형식으로 저장, 저장한 개수 반환.
+    chain 이 있으면 배치 단위로 필터를 적용하며, 배치들은 워커 풀에서 병렬 처리"""
+    indices = [i for i in indices if 0 <= i < len(frames)]
+    fmt = fmt or ExportFormat()
+
+    def save_chunk(part):
+        imgs = [frames[i] for i in part]
+        if chain: imgs = chain.run(imgs, [(i, None) for i in part])
+        for idx, rgb in zip(part, imgs):
+            fmt.save(rgb, os.path.join(folder, f'frame_{idx+1:04d}'))
+        return len(part)
+
+    chunks = [indices[k:k + FilterChain.BATCH] for k in range(0, len(indices), FilterChain.BATCH)]
+    with ThreadPoolExecutor(min(4, os.cpu_count() or 1)) as pool:
+        return sum(pool.map(save_chunk, chunks))
+
+
+def _sheet_tile(src, cw, ch):
+    """src 를 cw×ch 안에 맞게 축소 (큰 원본은 reducing_gap 으로 빠르게 줄임)"""
+    img = Image.fromarray(src)
+    img.thumbnail((cw, ch), Image.BILINEAR, reducing_gap=2.0)
+    return np.asarray(img)
+
+
+def save_contact_sheets(frames, indices, folder, cols=6, cell=(160, 100), rows=8,
+                        labels=True, thumbs=None, fmt=None, progress=None):
+    """indices 프레임을 cols×rows 격자 시트 여러 장으로 저장 → 저장한 파일 경로 목록.
+    캔버스는 한 장만 미리 잡아 재사용하고 시트마다 바로 기록하므로 프레임 수와 무관하게 메모리 일정.
+    thumbs = {프레임 번호: (원본 프레임, 썸네일 배열)} – 원본이 같고 셀에 맞춘 타일보다 작지 않으면
+    원본 대신 썸네일에서 줄임 (기본 셀 크기 = 프레임 선택 창 썸네일 크기). progress(done, n): 시트 단위"""
+    indices = [i for i in indices if 0 <= i < len(frames)]
+    thumbs  = thumbs or {}
+    fmt     = fmt or ExportFormat()
+    cw, ch  = cell
+    pad, lh = 8, (16 if labels else 0)
+    sw, sh  = cw + pad, ch + lh + pad                   # 셀 피치
+    canvas  = np.empty((rows * sh + pad, cols * sw + pad, 3), dtype=np.uint8)
+
+    def source(i):
+        rgb, t = frames[i], thumbs.get(i)
+        if t is None or t[0] is not rgb: return rgb
+        h, w = rgb.shape[:2]
+        s = min(cw / w, ch / h, 1.0)                    # 셀에 맞춘 타일 배율
+        return t[1] if t[1].shape[1] + 1 >= w * s and t[1].shape[0] + 1 >= h * s else rgb
+
+    paths, per = [], cols * rows
+    n_sheets = -(-len(indices) // per)
+    with ThreadPoolExecutor(min(4, os.cpu_count() or 1)) as pool:
+        for no, start in enumerate(range(0, len(indices), per), 1):
+            part  = indices[start:start + per]
+            tiles = list(pool.map(lambda i: _sheet_tile(source(i), cw, ch), part))
+            canvas[:] = 255
+            th, tw = tiles[0].shape[:2]
+            if all(t.shape == tiles[0].shape for t in tiles):
+                # 같은 크기 타일은 (행, 열) 격자 뷰에 한 번에 배치
+                n_rows = -(-len(tiles) // cols)
+                block  = np.full((n_rows * cols, th, tw, 3), 255, dtype=np.uint8)
+                block[:len(tiles)] = np.stack(tiles)
+                grid = canvas[pad:pad + n_rows * sh, pad:pad + cols * sw].reshape(n_rows, sh, cols, sw, 3)
+                oy, ox = (ch - th) // 2, (cw - tw) // 2
+                grid[:, oy:oy + th, :, ox:ox + tw] = block.reshape(n_rows, cols, th, tw, 3).transpose(0, 2, 1, 3, 4)
+            else:
+                for k, t in enumerate(tiles):
+                    r, c = divmod(k, cols)
+                    y = pad + r * sh + (ch - t.shape[0]) // 2
+                    x = pad + c * sw + (cw - t.shape[1]) // 2
+                    canvas[y:y + t.shape[0], x:x + t.shape[1]] = t
+            used = -(-len(part) // cols) * sh + pad        # 마지막 시트는 빈 줄 잘라냄
+            img = Image.fromarray(canvas[:used])
+            if labels:
+                draw = ImageDraw.Draw(img)
+                for k, idx in enumerate(part):
+                    r, c = divmod(k, cols)
+                    draw.text((pad + c * sw + 2, pad + r * sh + ch + 2), f'#{idx+1}', fill=(40, 40, 40))
+            paths.append(fmt.save(img, os.path.join(folder, f'sheet_{no:03d}')))
+            if progress: progress(no, n_sheets)
+    return paths
 
 
 # ──────────────────────────────────────────────────────────────
@@ -225,6 +1213,7 @@ class FramePickerWindow:
     THUMB_W = 160
     THUMB_H = 100
     COLS    = 3
+    BATCH   = 12     # idle 콜백 한 번에 붙이는 썸네일 수
     BG      = '#0e0e14'
     PANEL   = '#18181f'
     CARD    = '#1f1f29'
@@ -236,16 +1225,29 @@ class FramePickerWindow:
     DESEL   = '#2e2e3e'
     PREV_BG = '#13131e'
 
-    def __init__(self, parent, frames: list, bookmarks: set):
+    def __init__(self, parent, frames: list, bookmarks: set, get_chain=None,
+                 thumbs: dict | None = None, subscribe=None, fmt: ExportFormat | None = None):
         self.frames    = frames
         self.bookmarks = bookmarks   # 공유 참조 (메인과 동기화)
+        self.get_chain = get_chain or (lambda: None)   # 저장 시 적용할 필터 체인
+        self.fmt       = fmt or ExportFormat()         # 공유 참조 (메인의 저장 형식 설정)
+        self.thumbs    = {} if thumbs is None else thumbs   # 프레임 번호 → (원본, 썸네일) (메인과 공유, 재오픈 시 재사용)
         self.selected: set = set()
         self._refs         = []
         self._cells: list  = []
+        self._queued       = 0                    # 썸네일 워커에 넘긴 프레임 수
+        self._gen          = 0                    # 초기화 세대 (이전 세대 결과 무시)
+        self._jobs         = queue.Queue()
+        self._ready        = collections.deque()  # 워커가 만든 (세대, 프레임 번호)
         self._preview_ref  = None
         self._cur_idx      = -1
         self.select_mode   = tk.BooleanVar(value=False)
         self.interval_var  = tk.IntVar(value=5)
+        self._prev_geom    = None      # 미리보기 이미지 (x0, y0, scale)
+        self._patch_mode   = False     # 미리보기 드래그 = 찾을 패치 지정
+        self._patch_rect   = None
+        self._search_stop  = threading.Event()
+        self._stitching    = False     # 스크롤 이어붙이기 작업 중
 
         self.win = tk.Toplevel(parent)
         self.win.title('FrameSnap – 프레임 선택 & 저장')
@@ -255,9 +1257,19 @@ class FramePickerWindow:
 
         self.win.bind('<Left>',  lambda e: self._prev_nav(-1))
         self.win.bind('<Right>', lambda e: self._prev_nav(1))
+        self.win.bind('<Destroy>', lambda e: e.widget is self.win and self._on_destroy())
 
         self._build()
-        self._load_all_thumbs()
+        # 녹화가 계속되는 동안 새 프레임을 구독해 썸네일을 조금씩 추가
+        self._unsubscribe = subscribe(self._on_frames) if subscribe else None
+        threading.Thread(target=self._thumb_worker, daemon=True).start()
+        self._on_frames(len(self.frames))
+        self._pump()
+
+    def _on_destroy(self):
+        self._search_stop.set()
+        self._jobs.put(None)
+        if self._unsubscribe: self._unsubscribe()
 
     def _btn(self, parent, text, cmd, bg=None, fg=None, **kw):
         return tk.Button(parent, text=text, command=cmd,
@@ -296,6 +1308,18 @@ class FramePickerWindow:
         tk.Frame(tools, bg='#2e2e3e', width=1).pack(side='left', fill='y', pady=6, padx=4)
         self._btn(tools, '🔖 책갈피만 저장', self.save_bookmarks,
                   bg='#3a3010', fg=self.GOLD).pack(side='left', padx=6, pady=7)
+        self._btn(tools, '📜 스크롤 이어붙이기', self.save_scroll_stitch,
+                  bg='#2a2a50').pack(side='left', padx=4, pady=7)
+        self._btn(tools, '🗂 콘택트 시트', self._open_sheet_dialog,
+                  bg='#2a2a50').pack(side='left', padx=4, pady=7)
+        find = tk.Menubutton(tools, text='🔍 패치 찾기', bg='#2a2a50', fg=self.TEXT, relief='flat',
+                             activebackground='#2a2a50', activeforeground=self.TEXT,
+                             font=('맑은 고딕', 9, 'bold'), padx=10, pady=5, cursor='hand2', bd=0)
+        menu = tk.Menu(find, tearoff=False)
+        menu.add_command(label='미리보기에서 영역 드래그', command=self._start_patch_mode)
+        menu.add_command(label='이미지 파일 불러오기…', command=self._search_from_file)
+        find['menu'] = menu
+        find.pack(side='left', padx=4, pady=7)
         self._btn(tools, '💾 선택 저장', self.save_selected,
                   bg=self.ACCENT, fg=self.BG).pack(side='right', padx=14, pady=7)
 
@@ -356,27 +1380,78 @@ class FramePickerWindow:
         self.prev_canvas = tk.Canvas(right, bg=self.PREV_BG, highlightthickness=0)
         self.prev_canvas.pack(fill='both', expand=True, padx=10, pady=10)
         self.prev_canvas.bind('<Configure>', lambda e: self._show_preview(self._cur_idx))
+        self.prev_canvas.bind('<ButtonPress-1>',   self._patch_press)
+        self.prev_canvas.bind('<B1-Motion>',       self._patch_drag)
+        self.prev_canvas.bind('<ButtonRelease-1>', self._patch_release)
 
         self.prev_hint = tk.Label(right,
                                    text='썸네일을 클릭하면\n여기에 크게 표시됩니다.\n\n← → 키로 이동',
                                    bg=self.PREV_BG, fg=self.MUTED, font=('맑은 고딕', 11))
         self.prev_hint.place(relx=0.5, rely=0.5, anchor='center')
 
-    def _load_all_thumbs(self):
-        """열릴 때 전체 썸네일 한 번에 로드"""
+    # ── 썸네일: 워커 스레드에서 축소 → idle 콜백에서 조금씩 셀 추가
+    def _on_frames(self, total):
+        """메인 앱의 프레임 수 알림 (UI 스레드)"""
+        if total < self._queued: self._reset_grid()
+        for i in range(self._queued, total):
+            self._jobs.put((self._gen, i))
+        self._queued = max(self._queued, total)
+
+    def _thumb_worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None: return
+            gen, i = job
+            if gen != self._gen: continue
+            try: rgb = self.frames[i]
+            except IndexError: continue         # 그 사이 초기화됨
+            # 캐시는 원본 프레임과 짝지어 두고 동일 객체일 때만 재사용 →
+            # 초기화와 엇갈려 늦게 저장된 이전 세션 썸네일은 새 프레임과 맞지 않아 버려짐
+            cached = self.thumbs.get(i)
+            if cached is None or cached[0] is not rgb:
+                img = Image.fromarray(rgb)
+                img.thumbnail((self.THUMB_W, self.THUMB_H), Image.LANCZOS)
+                if gen != self._gen: continue
+                self.thumbs[i] = (rgb, np.asarray(img))
+            self._ready.append((gen, i))
+
+    def _pump(self):
+        try:
+            n = 0
+            while self._ready and n < self.BATCH:
+                gen, i = self._ready.popleft()
+                if gen == self._gen and i == len(self._cells):
+                    self._add_thumb(i)
+                    n += 1
+            if n: self._update_status()
+            # 남은 게 있으면 바로 다음 idle 에, 없으면 잠시 후 다시 확인
+            if self._ready: self.win.after_idle(self._pump)
+            else:           self.win.after(60, self._pump)
+        except tk.TclError: pass          # 창 닫힘
+
+    def _reset_grid(self):
+        """메인에서 초기화됨 – 그리드 비우고 처음부터"""
+        self._gen += 1
+        self._ready.clear()
+        for c, _ in self._cells: c.destroy()
+        self._cells.clear()
+        self._refs.clear()
+        self.selected.clear()
+        self._queued, self._cur_idx = 0, -1
+        self.prev_canvas.delete('all')
+        self.prev_title.config(text='')
+        self.prev_hint.place(relx=0.5, rely=0.5, anchor='center')
+        self.empty_lbl.grid(row=0, column=0, columnspan=self.COLS, pady=60)
+        self._update_status()
+
+    def _add_thumb(self, idx):
         if self.empty_lbl.winfo_ismapped():
             self.empty_lbl.grid_forget()
-        for idx, rgb in enumerate(self.frames):
-            self._add_thumb(rgb, idx)
-
-    def _add_thumb(self, rgb, idx):
-        img = Image.fromarray(rgb)
-        img.thumbnail((self.THUMB_W, self.THUMB_H), Image.LANCZOS)
-        photo = ImageTk.PhotoImage(img)
+        photo = ImageTk.PhotoImage(Image.fromarray(self.thumbs[idx][1]))
         self._refs.append(photo)
         row, col = divmod(idx, self.COLS)
-        cell = tk.Frame(self.gf, bg=self.CARD,
-                         highlightthickness=2, highlightbackground=self.DESEL,
+        cell = tk.Frame(self.gf, bg=self.CARD, highlightthickness=2,
+                         highlightbackground=self.SEL if idx in self.selected else self.DESEL,
                          cursor='hand2')
         cell.grid(row=row, column=col, padx=5, pady=5, sticky='nsew')
         il = tk.Label(cell, image=photo, bg=self.CARD)
@@ -464,6 +1539,7 @@ class FramePickerWindow:
         self._preview_ref = ImageTk.PhotoImage(img)
         self.prev_canvas.delete('all')
         self.prev_canvas.create_image(cw // 2 + 10, ch // 2 + 10, image=self._preview_ref, anchor='center')
+        self._prev_geom = (cw // 2 + 10 - nw // 2, ch // 2 + 10 - nh // 2, scale)
         self.prev_title.config(text=f'#{idx+1} / {len(self.frames)}')
         self.btn_bm.config(fg=self.GOLD if idx in self.bookmarks else self.MUTED)
 
@@ -495,16 +1571,644 @@ class FramePickerWindow:
             return
         self._save_frames(sorted(self.bookmarks), '책갈피')
 
+    def save_scroll_stitch(self):
+        if self._stitching: return
+        indices = sorted(self.selected) or list(range(len(self.frames)))
+        if len(indices) < 2:
+            messagebox.showwarning('알림', '이어붙일 프레임이 2개 이상 필요합니다.')
+            return
+        path = filedialog.asksaveasfilename(title='이어붙인 이미지 저장', defaultextension='.png',
+                                            initialfile='scroll.png', filetypes=[('PNG', '*.png')])
+        if not path: return
+        level = self.fmt.level if self.fmt.kind == 'PNG' else 6
+        frames = list(self.frames)              # 작업 중 초기화돼도 이번 결과는 그대로
+        self._stitching = True
+        t0 = time.perf_counter()
+
+        def progress(done, n):
+            self._post(self.sel_var.set, f'📜 이어붙이는 중...  {done * 100 // n}%')
+
+        def work():
+            try:
+                res = stitch_scroll(frames, indices, path, level=level, progress=progress)
+            except (ValueError, OSError) as e:
+                res = e
+            self._post(self._stitch_done, res, path, time.perf_counter() - t0)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _stitch_done(self, res, path, elapsed):
+        self._stitching = False
+        self._update_status()
+        if isinstance(res, Exception):
+            messagebox.showerror('오류', f'이어붙이기 실패:\n{res}', parent=self.win)
+            return
+        used, height, skipped = res
+        note = f'\n⚠️ 겹치는 위치를 못 찾은 프레임 {skipped}개 건너뜀' if skipped else ''
+        messagebox.showinfo('저장 완료',
+                            f'✅ 프레임 {used}개 이어붙임  (높이 {height}px, {elapsed:.1f}초){note}'
+                            f'\n\n📁 {path}', parent=self.win)
+
+    # ── 콘택트 시트
+    def _open_sheet_dialog(self):
+        dlg = tk.Toplevel(self.win)
+        dlg.title('콘택트 시트')
+        dlg.configure(bg=self.BG)
+        dlg.resizable(False, False)
+        src  = tk.StringVar(value='selected' if self.selected else 'bookmarks' if self.bookmarks else 'all')
+        vars_ = {k: tk.IntVar(value=v) for k, v in
+                 [('cols', 6), ('rows', 8), ('cw', self.THUMB_W), ('ch', self.THUMB_H)]}
+        label_var = tk.BooleanVar(value=True)
+
+        f = tk.Frame(dlg, bg=self.BG)
+        f.pack(padx=14, pady=10)
+        for r, (val, txt) in enumerate([('selected', f'선택 ({len(self.selected)})'),
+                                         ('bookmarks', f'책갈피 ({len(self.bookmarks)})'),
+                                         ('all', f'전체 ({len(self.frames)})')]):
+            tk.Radiobutton(f, text=txt, value=val, variable=src, bg=self.BG, fg=self.TEXT,
+                           selectcolor='#252530', activebackground=self.BG,
+                           font=('맑은 고딕', 9)).grid(row=0, column=r, sticky='w', padx=2)
+        for r, (key, txt, lo, hi) in enumerate([('cols', '열 수', 1, 20), ('rows', '시트당 행 수', 1, 40),
+                                                ('cw', '셀 너비', 40, 1920), ('ch', '셀 높이', 30, 1080)], 1):
+            tk.Label(f, text=txt, bg=self.BG, fg=self.MUTED,
+                     font=('맑은 고딕', 9)).grid(row=r, column=0, sticky='w', pady=2)
+            tk.Spinbox(f, from_=lo, to=hi, textvariable=vars_[key], width=6,
+                       bg='#252530', fg=self.TEXT, insertbackground=self.TEXT, relief='flat',
+                       font=('Consolas', 10), justify='center',
+                       buttonbackground='#252530').grid(row=r, column=1, sticky='w')
+        tk.Checkbutton(f, text='프레임 번호 표시', variable=label_var, bg=self.BG, fg=self.TEXT,
+                       selectcolor='#252530', activebackground=self.BG,
+                       font=('맑은 고딕', 9)).grid(row=5, column=0, columnspan=3, sticky='w', pady=4)
+
+        def run():
+            indices = {'selected': sorted(self.selected), 'bookmarks': sorted(self.bookmarks),
+                       'all': list(range(len(self.frames)))}[src.get()]
+            if not indices:
+                messagebox.showwarning('알림', '내보낼 프레임이 없습니다.', parent=dlg)
+                return
+            try:
+                opts = {k: max(1, v.get()) for k, v in vars_.items()}
+            except tk.TclError:
+                messagebox.showwarning('알림', '숫자를 입력하세요.', parent=dlg)
+                return
+            folder = filedialog.askdirectory(title='저장 폴더 선택', parent=dlg)
+            if not folder: return
+            labels = label_var.get()
+            dlg.destroy()
+            frames = list(self.frames)              # 작업 중 초기화돼도 이번 결과는 그대로
+            t0 = time.perf_counter()
+
+            def progress(done, n):
+                self._post(self.sel_var.set, f'🗂 콘택트 시트 저장 중...  {done} / {n}장')
+
+            def work():
+                try:
+                    res = save_contact_sheets(frames, indices, folder, opts['cols'], (opts['cw'], opts['ch']),
+                                              opts['rows'], labels, self.thumbs, self.fmt, progress)
+                except (OSError, ValueError) as e:
+                    res = e
+                self._post(self._sheets_done, res, len(indices), folder, time.perf_counter() - t0)
+
+            threading.Thread(target=work, daemon=True).start()
+
+        self._btn(dlg, '🗂 시트 저장', run, bg=self.ACCENT, fg=self.BG).pack(pady=(0, 12))
+
+    def _sheets_done(self, res, n, folder, elapsed):
+        self._update_status()
+        if isinstance(res, Exception):
+            messagebox.showerror('오류', f'콘택트 시트 저장 실패:\n{res}', parent=self.win)
+            return
+        messagebox.showinfo('저장 완료', f'✅ 콘택트 시트 {len(res)}장 ({n}프레임, {elapsed:.1f}초)'
+                            f'\n\n📁 {folder}', parent=self.win)
+
+    def _post(self, fn, *args):
+        """작업 스레드 → Tk 스레드로 결과 전달 (창이 이미 닫혔으면 무시)"""
+        try: self.win.after(0, fn, *args)
+        except (tk.TclError, RuntimeError): pass
+
+    # ── 패치(템플릿) 검색
+    def _start_patch_mode(self):
+        if self._cur_idx < 0:
+            messagebox.showwarning('알림', '먼저 썸네일을 클릭해 미리보기를 띄우세요.', parent=self.win)
+            return
+        self._patch_mode = True
+        self.prev_canvas.config(cursor='cross')
+        self.sel_var.set('🔍 미리보기에서 찾을 영역을 드래그하세요')
+
+    def _patch_press(self, e):
+        if not self._patch_mode: return
+        self._patch_start = (e.x, e.y)
+        self._patch_rect = self.prev_canvas.create_rectangle(e.x, e.y, e.x, e.y, outline=self.GOLD, width=2)
+
+    def _patch_drag(self, e):
+        if self._patch_mode and self._patch_rect:
+            self.prev_canvas.coords(self._patch_rect, *self._patch_start, e.x, e.y)
+
+    def _patch_release(self, e):
+        if not (self._patch_mode and self._patch_rect): return
+        self._patch_mode, self._patch_rect = False, None
+        self.prev_canvas.config(cursor='')
+        x0, y0, scale = self._prev_geom
+        rgb = self.frames[self._cur_idx]
+        (ax, bx), (ay, by) = sorted((self._patch_start[0], e.x)), sorted((self._patch_start[1], e.y))
+        fx0, fx1 = (max(0, min(int((v - x0) / scale), rgb.shape[1])) for v in (ax, bx))
+        fy0, fy1 = (max(0, min(int((v - y0) / scale), rgb.shape[0])) for v in (ay, by))
+        if fx1 - fx0 < 8 or fy1 - fy0 < 8:
+            self._update_status()
+            messagebox.showwarning('알림', '영역이 너무 작습니다 (최소 8×8).', parent=self.win)
+            return
+        self._run_search(rgb[fy0:fy1, fx0:fx1].copy())
+
+    def _search_from_file(self):
+        path = filedialog.askopenfilename(title='찾을 이미지 선택', parent=self.win,
+                                          filetypes=[('이미지', '*.png *.jpg *.jpeg *.bmp *.webp'), ('모든 파일', '*.*')])
+        if not path: return
+        self._run_search(np.asarray(Image.open(path).convert('RGB')))
+
+    def _run_search(self, tmpl):
+        try:
+            search = TemplateSearch(tmpl)
+        except ValueError as e:
+            messagebox.showwarning('알림', str(e), parent=self.win)
+            return
+        total = len(self.frames)
+        t0 = time.perf_counter()
+
+        def progress(done, n):
+            self.win.after(0, lambda: self.sel_var.set(f'🔍 패치 검색 중...  {done} / {n}'))
+
+        def work():
+            hits = search.run(self.frames, range(total), progress, self._search_stop)
+            if not self._search_stop.is_set():
+                self.win.after(0, self._search_done, hits, time.perf_counter() - t0)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _search_done(self, hits, elapsed):
+        self.selected = set(hits)
+        for i, (c, _) in enumerate(self._cells):
+            c.config(highlightbackground=self.SEL if i in self.selected else self.DESEL)
+        self._update_status()
+        if hits: self._show_preview(min(hits))
+        messagebox.showinfo('패치 검색', f'{len(hits)}개 프레임에서 발견 → 선택됨  ({elapsed:.1f}초)',
+                            parent=self.win)
+
     def _save_frames(self, indices, label):
         folder = filedialog.askdirectory(title='저장 폴더 선택')
         if not folder: return
-        saved = 0
-        for idx in indices:
-            if idx < len(self.frames):
-                Image.fromarray(self.frames[idx]).save(
-                    os.path.join(folder, f'frame_{idx+1:04d}.png'))
-                saved += 1
-        messagebox.showinfo('저장 완료', f'✅ {label} {saved}개 저장 완료\n\n📁 {folder}')
+        chain = self.get_chain()
+        if chain: chain.reset_stats()
+        t0 = time.perf_counter()
+        saved = save_frames(self.frames, indices, folder, chain, self.fmt)
+        msg = (f'✅ {label} {saved}개 저장 완료  ({self.fmt.label()}, {time.perf_counter()-t0:.1f}초)'
+               f'\n\n📁 {folder}')
+        if chain: msg += f'\n\n⏱ 필터 처리 시간\n{chain.report()}'
+        messagebox.showinfo('저장 완료', msg)
+
+
+# ──────────────────────────────────────────────────────────────
+# 서브 팝업: 프레임 필터 설정
+# ──────────────────────────────────────────────────────────────
+class FilterWindow:
+    BG    = '#0e0e14'
+    CARD  = '#1f1f29'
+    ACCENT= '#00FFB3'
+    TEXT  = '#e4e4f0'
+    MUTED = '#5a5a72'
+    KINDS = ['영역 가리기', '그레이스케일', '샤프닝', '타임스탬프']
+
+    def __init__(self, parent, chain: FilterChain, mode: tk.StringVar):
+        self.chain, self.mode = chain, mode
+        active = [f.name for f in chain.filters]
+        # 현재 체인 순서 먼저, 나머지는 꺼진 상태로 뒤에
+        self.order   = active + [k for k in self.KINDS if k not in active]
+        self.enabled = set(active)
+        redact = next((f for f in chain.filters if isinstance(f, RedactFilter)), None)
+        self.rect_var = tk.StringVar(value=','.join(map(str, redact.rect)) if redact else '0,0,200,40')
+
+        self.win = tk.Toplevel(parent)
+        self.win.title('FrameSnap – 프레임 필터')
+        self.win.geometry('420x440')
+        self.win.configure(bg=self.BG)
+        self._build()
+        self._refresh()
+
+    def _build(self):
+        mode_f = tk.Frame(self.win, bg=self.BG)
+        mode_f.pack(fill='x', padx=12, pady=(12, 4))
+        for val, txt in [('off', '끄기'), ('capture', '녹화 중 적용'), ('export', '저장 시 적용')]:
+            tk.Radiobutton(mode_f, text=txt, value=val, variable=self.mode,
+                           bg=self.BG, fg=self.TEXT, selectcolor='#252530',
+                           activebackground=self.BG, font=('맑은 고딕', 9)).pack(side='left', padx=4)
+
+        tk.Label(self.win, text='더블클릭 = 켜기/끄기   ▲▼ = 적용 순서', bg=self.BG, fg=self.MUTED,
+                 font=('맑은 고딕', 8)).pack(anchor='w', padx=14)
+        mid = tk.Frame(self.win, bg=self.BG)
+        mid.pack(fill='x', padx=12, pady=4)
+        self.lb = tk.Listbox(mid, height=len(self.KINDS), bg=self.CARD, fg=self.TEXT,
+                             selectbackground='#2a2a50', relief='flat', font=('맑은 고딕', 10),
+                             activestyle='none', exportselection=False)
+        self.lb.pack(side='left', fill='x', expand=True)
+        self.lb.bind('<Double-Button-1>', lambda e: self._toggle())
+        btns = tk.Frame(mid, bg=self.BG)
+        btns.pack(side='left', padx=6)
+        for txt, d in [('▲', -1), ('▼', 1)]:
+            tk.Button(btns, text=txt, command=lambda d=d: self._move(d), bg='#2e2e3e', fg='white',
+                      relief='flat', font=('Consolas', 10), padx=8, cursor='hand2', bd=0).pack(pady=2)
+
+        rect_f = tk.Frame(self.win, bg=self.BG)
+        rect_f.pack(fill='x', padx=12, pady=4)
+        tk.Label(rect_f, text='가릴 영역 x,y,w,h:', bg=self.BG, fg=self.MUTED,
+                 font=('맑은 고딕', 9)).pack(side='left')
+        tk.Entry(rect_f, textvariable=self.rect_var, width=18, bg='#252530', fg=self.TEXT,
+                 insertbackground=self.TEXT, relief='flat', font=('Consolas', 10)).pack(side='left', padx=6)
+
+        tk.Button(self.win, text='적용', command=self._apply, bg=self.ACCENT, fg=self.BG,
+                  relief='flat', font=('맑은 고딕', 9, 'bold'), padx=16, pady=5,
+                  cursor='hand2', bd=0).pack(pady=8)
+
+        self.stats_var = tk.StringVar()
+        tk.Label(self.win, textvariable=self.stats_var, bg=self.BG, fg=self.MUTED, justify='left',
+                 font=('Consolas', 8)).pack(anchor='w', padx=14)
+        self._poll_stats()
+
+    def _refresh(self):
+        self.lb.delete(0, 'end')
+        for k in self.order:
+            self.lb.insert('end', ('☑ ' if k in self.enabled else '☐ ') + k)
+
+    def _toggle(self):
+        sel = self.lb.curselection()
+        if not sel: return
+        k = self.order[sel[0]]
+        self.enabled.symmetric_difference_update({k})
+        self._refresh()
+        self.lb.selection_set(sel[0])
+
+    def _move(self, d):
+        sel = self.lb.curselection()
+        if not sel or not 0 <= sel[0] + d < len(self.order): return
+        i = sel[0]
+        self.order[i], self.order[i+d] = self.order[i+d], self.order[i]
+        self._refresh()
+        self.lb.selection_set(i + d)
+
+    def _make(self, kind):
+        if kind == '영역 가리기':
+            x, y, w, h = (int(v) for v in self.rect_var.get().split(','))
+            return RedactFilter(x, y, w, h)
+        return {'그레이스케일': GrayscaleFilter, '샤프닝': SharpenFilter,
+                '타임스탬프': TimestampFilter}[kind]()
+
+    def _apply(self):
+        try:
+            filters = [self._make(k) for k in self.order if k in self.enabled]
+        except ValueError:
+            messagebox.showwarning('알림', '가릴 영역은 x,y,w,h 정수 4개로 입력하세요.', parent=self.win)
+            return
+        self.chain.filters = filters
+        self.chain.reset_stats()
+        self.win.destroy()
+
+    def _poll_stats(self):
+        try:
+            self.stats_var.set(self.chain.report() or '처리 기록 없음')
+            self.win.after(1000, self._poll_stats)
+        except tk.TclError: pass
+
+
+# ──────────────────────────────────────────────────────────────
+# 서브 팝업: 내보내기 형식 설정 & 비교
+# ──────────────────────────────────────────────────────────────
+class ExportFormatWindow:
+    BG    = '#0e0e14'
+    CARD  = '#1f1f29'
+    ACCENT= '#00FFB3'
+    TEXT  = '#e4e4f0'
+    MUTED = '#5a5a72'
+
+    def __init__(self, parent, fmt: ExportFormat, frames: list):
+        self.fmt, self.frames = fmt, frames
+        kinds = [k for k in ExportFormat.KINDS if WEBP_AVAILABLE or k != 'WebP 무손실']
+        self.kind_var   = tk.StringVar(value=fmt.kind)
+        self.level_var  = tk.IntVar(value=fmt.level)
+        self.strat_var  = tk.StringVar(value=fmt.strategy)
+        self.effort_var = tk.IntVar(value=fmt.effort)
+
+        self.win = tk.Toplevel(parent)
+        self.win.title('FrameSnap – 저장 형식')
+        self.win.geometry('520x460')
+        self.win.configure(bg=self.BG)
+
+        f = tk.Frame(self.win, bg=self.BG)
+        f.pack(fill='x', padx=14, pady=10)
+        rows = [('형식', ttk.Combobox(f, textvariable=self.kind_var, values=kinds, state='readonly', width=16)),
+                ('PNG 압축 레벨', tk.Scale(f, from_=0, to=9, orient='horizontal', variable=self.level_var,
+                                          bg=self.BG, fg=self.TEXT, highlightthickness=0, length=160)),
+                ('PNG zlib 전략', ttk.Combobox(f, textvariable=self.strat_var, state='readonly', width=16,
+                                             values=list(ExportFormat.STRATEGIES))),
+                ('WebP 노력 (0~6)', tk.Spinbox(f, from_=0, to=6, textvariable=self.effort_var, width=4,
+                                              bg='#252530', fg=self.TEXT, relief='flat',
+                                              buttonbackground='#252530', justify='center'))]
+        for r, (txt, w) in enumerate(rows):
+            tk.Label(f, text=txt, bg=self.BG, fg=self.MUTED,
+                     font=('맑은 고딕', 9)).grid(row=r, column=0, sticky='w', pady=3, padx=(0, 10))
+            w.grid(row=r, column=1, sticky='w')
+
+        btn_f = tk.Frame(self.win, bg=self.BG)
+        btn_f.pack(fill='x', padx=14)
+        for txt, cmd, bg, fg in [('적용', self._apply, self.ACCENT, self.BG),
+                                  ('⏱ 현재 녹화로 비교', self._compare, '#2a2a50', self.TEXT)]:
+            tk.Button(btn_f, text=txt, command=cmd, bg=bg, fg=fg, relief='flat',
+                      font=('맑은 고딕', 9, 'bold'), padx=12, pady=5,
+                      cursor='hand2', bd=0).pack(side='left', padx=(0, 6))
+
+        self.out = tk.Text(self.win, bg=self.CARD, fg=self.TEXT, relief='flat',
+                           font=('Consolas', 9), height=14)
+        self.out.pack(fill='both', expand=True, padx=14, pady=10)
+        self._write(f'현재 설정: {fmt.label()}')
+
+    def _write(self, text):
+        self.out.delete('1.0', 'end')
+        self.out.insert('end', text)
+
+    def _apply(self):
+        try:
+            effort = max(0, min(6, self.effort_var.get()))
+        except tk.TclError:
+            effort = self.fmt.effort
+        self.fmt.kind, self.fmt.level = self.kind_var.get(), self.level_var.get()
+        self.fmt.strategy, self.fmt.effort = self.strat_var.get(), effort
+        self._write(f'적용됨: {self.fmt.label()}')
+
+    def _compare(self):
+        if not self.frames:
+            messagebox.showwarning('알림', '먼저 녹화를 진행하세요.', parent=self.win)
+            return
+        self._write('인코딩 비교 중...')
+
+        def work():
+            results = compare_formats(self.frames)
+            try: self.win.after(0, self._show_results, results)
+            except tk.TclError: pass
+        threading.Thread(target=work, daemon=True).start()
+
+    def _show_results(self, results):
+        raw = results[-1][2] if results else 1           # PPM = 무압축 기준
+        lines = [f'{"형식":<24}{"ms/프레임":>10}{"KB/프레임":>11}{"비율":>7}', '─' * 52]
+        for fmt, ms, size in results:
+            lines.append(f'{fmt.label():<24}{ms:>10.1f}{size / 1024:>11.0f}{size / raw:>7.0%}')
+        lines.append(f'\n샘플 {min(6, len(self.frames))}프레임 평균  |  현재 설정: {self.fmt.label()}')
+        self._write('\n'.join(lines))
+
+
+# ──────────────────────────────────────────────────────────────
+# 자동화용 로컬 제어 API (127.0.0.1 HTTP)
+# ──────────────────────────────────────────────────────────────
+STREAM_HEADER = struct.Struct('<iIII')   # idx(-1 = keep-alive), h, w, c  + raw RGB 바이트
+TOKEN_HEADER  = 'X-FrameSnap-Token'
+
+
+class _FrameSubscriber:
+    """스트림 구독자 한 명의 큐 – 가득 차면 가장 오래된 프레임부터 버림"""
+
+    def __init__(self, backlog):
+        self.buf     = collections.deque(maxlen=backlog)
+        self.ready   = threading.Event()
+        self.dropped = 0
+
+    def push(self, idx, rgb):
+        if len(self.buf) == self.buf.maxlen: self.dropped += 1
+        self.buf.append((idx, rgb))
+        self.ready.set()
+
+    def pop(self, timeout):
+        if not self.buf and not self.ready.wait(timeout): return None
+        self.ready.clear()
+        try: return self.buf.popleft()
+        except IndexError: return None
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+    ctl = None                                  # ControlServer 가 서브클래스에 주입
+
+    def log_message(self, *args): pass
+
+    def _json(self, obj, code=200):
+        body = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        n = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(n) or b'{}')
+
+    def _allowed(self, post):
+        """브라우저발 요청 차단: 다른 Host(DNS 리바인딩), Origin 헤더(교차 사이트),
+        JSON 이 아닌 POST(단순 요청), 토큰 불일치는 모두 거절. 거절했으면 False"""
+        port = self.ctl.port
+        if self.headers.get('Host') not in (f'127.0.0.1:{port}', f'localhost:{port}'):
+            self._json({'error': 'Host 불일치'}, 403)
+        elif 'Origin' in self.headers:
+            self._json({'error': '브라우저 요청은 허용하지 않음'}, 403)
+        elif post and self.headers.get_content_type() != 'application/json':
+            self._json({'error': 'Content-Type 은 application/json 이어야 함'}, 415)
+        elif not secrets.compare_digest(self.headers.get(TOKEN_HEADER, ''), self.ctl.token):
+            self._json({'error': f'{TOKEN_HEADER} 헤더의 토큰이 필요함'}, 401)
+        else:
+            return True
+        return False
+
+    def do_GET(self):
+        if not self._allowed(post=False): return
+        url   = urlparse(self.path)
+        thumb = parse_qs(url.query).get('thumb', ['0'])[0] == '1'
+        app   = self.ctl.app
+        try:
+            if url.path == '/status':
+                self._json(self.ctl.status())
+            elif url.path == '/bookmarks':
+                self._json(sorted(app.bookmarks))
+            elif url.path.startswith('/frames/'):
+                idx = int(url.path.rsplit('/', 1)[1])
+                if not 0 <= idx < len(app.frames):
+                    return self._json({'error': f'프레임 #{idx} 없음'}, 404)
+                arr = self.ctl.payload(app.frames[idx], thumb)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(arr.nbytes))
+                self.send_header('X-Frame-Index', str(idx))
+                self.send_header('X-Frame-Shape', ','.join(map(str, arr.shape)))
+                self.end_headers()
+                self.wfile.write(arr.data.cast('B'))
+            elif url.path == '/stream':
+                self._stream(thumb)
+            else:
+                self._json({'error': 'not found'}, 404)
+        except ValueError as e:
+            self._json({'error': str(e)}, 400)
+
+    def do_POST(self):
+        if not self._allowed(post=True): return
+        path = urlparse(self.path).path
+        app  = self.ctl.app
+        try:
+            body = self._body()
+            if path == '/record/start':
+                region = {k: int(body['region'][k]) for k in ('top', 'left', 'width', 'height')}
+                source = SyntheticScreen if body.get('synthetic') else None
+                self.ctl.call_ui(app.start_recording_region, region, body.get('fps'), source)
+            elif path == '/record/stop':
+                self.ctl.call_ui(app.stop_recording)
+            elif path in ('/bookmarks', '/bookmarks/remove'):
+                self.ctl.call_ui(app.set_bookmark, int(body['index']), path == '/bookmarks')
+            elif path == '/export':
+                indices = sorted(app.bookmarks) if body.get('bookmarks') else \
+                          body.get('indices', range(len(app.frames)))
+                chain = self.ctl.call_ui(app._export_chain)     # UI 내보내기와 같은 '저장 시 적용' 필터
+                return self._json({'saved': save_frames(app.frames, indices, body['folder'],
+                                                        chain, app.export_fmt)})
+            else:
+                return self._json({'error': 'not found'}, 404)
+            self._json(self.ctl.status())
+        except (KeyError, TypeError, ValueError, RuntimeError, OSError, tk.TclError) as e:
+            self._json({'error': str(e)}, 400)
+
+    def _stream(self, thumb):
+        sub = self.ctl.subscribe()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-framesnap-stream')
+        self.end_headers()
+        try:
+            while self.ctl.running:
+                item = sub.pop(1.0)
+                if item is None:                # 끊긴 클라이언트 감지용 keep-alive
+                    self.wfile.write(STREAM_HEADER.pack(-1, 0, 0, 0))
+                    continue
+                idx, rgb = item
+                arr = self.ctl.payload(rgb, thumb)
+                self.wfile.write(STREAM_HEADER.pack(idx, *arr.shape))
+                self.wfile.write(arr.data.cast('B'))
+        except OSError:
+            pass
+        finally:
+            self.ctl.unsubscribe(sub)
+
+
+class ControlServer:
+    """로컬 자동화용 HTTP 제어 서버 (127.0.0.1 전용)
+    GET  /status  /bookmarks  /frames/<i>[?thumb=1]  /stream[?thumb=1]
+    POST /record/start {region, fps, synthetic}  /record/stop
+         /bookmarks {index}  /bookmarks/remove {index}  /export {folder, indices | bookmarks}
+    프레임은 PNG 인코딩 없이 raw RGB 바이트로 전달.
+    모든 요청은 Host 가 127.0.0.1/localhost:port 이고 Origin 이 없으며 TOKEN_HEADER 에
+    token 을 담아야 함 (POST 는 application/json 만)"""
+    STREAM_BACKLOG = 4
+    THUMB_MAX      = 160
+
+    def __init__(self, app, port=8765, token=None):
+        self.app     = app
+        self.token   = token or secrets.token_urlsafe(16)
+        self.running = False
+        self._subs   = set()
+        self._lock   = threading.Lock()
+        handler = type('Handler', (_ControlHandler,), {'ctl': self})
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def subscribe(self):
+        sub = _FrameSubscriber(self.STREAM_BACKLOG)
+        with self._lock: self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock: self._subs.discard(sub)
+
+    def publish(self, idx, rgb):
+        """캡처 스레드에서 호출 – 구독자 큐에 참조만 넣고 즉시 반환"""
+        with self._lock: subs = list(self._subs)
+        for sub in subs: sub.push(idx, rgb)
+
+    def payload(self, rgb, thumb):
+        if thumb:
+            step = max(1, -(-max(rgb.shape[:2]) // self.THUMB_MAX))
+            rgb = rgb[::step, ::step]
+        return np.ascontiguousarray(rgb)
+
+    def status(self):
+        rec = self.app.recorder
+        return {'recording': rec is not None, 'fps': rec.fps if rec else None,
+                'frames': len(self.app.frames), 'bookmarks': len(self.app.bookmarks)}
+
+    def call_ui(self, fn, *args):
+        """Tk 메인 스레드에서 fn 을 실행하고 결과를 돌려줌 (예외는 그대로 전달)"""
+        done, box = threading.Event(), {}
+        def run():
+            try: box['result'] = fn(*args)
+            except Exception as e: box['error'] = e
+            finally: done.set()
+        self.app.root.after(0, run)
+        if not done.wait(5): raise RuntimeError('UI 응답 시간 초과')
+        if 'error' in box: raise box['error']
+        return box.get('result')
+
+
+class ControlClient:
+    """ControlServer 용 최소 클라이언트 (테스트 하네스에서 사용)"""
+
+    def __init__(self, port=8765, token='', host='127.0.0.1'):
+        self.base  = f'http://{host}:{port}'
+        self.token = token
+
+    def _req(self, path, body=None):
+        data = None if body is None else json.dumps(body).encode('utf-8')
+        req  = urllib.request.Request(self.base + path, data=data,
+                                      headers={'Content-Type': 'application/json',
+                                               TOKEN_HEADER: self.token})
+        return urllib.request.urlopen(req, timeout=10)
+
+    def call(self, path, **body):
+        """POST path (JSON 본문) → JSON 응답"""
+        with self._req(path, body) as r:
+            return json.loads(r.read())
+
+    def status(self):
+        with self._req('/status') as r:
+            return json.loads(r.read())
+
+    def stop(self):         return self.call('/record/stop')
+    def bookmark(self, i):  return self.call('/bookmarks', index=i)
+
+    def start(self, region, fps=None, synthetic=False):
+        return self.call('/record/start', region=region, fps=fps, synthetic=synthetic)
+
+    def frame(self, idx, thumb=False):
+        with self._req(f'/frames/{idx}' + ('?thumb=1' if thumb else '')) as r:
+            shape = tuple(int(v) for v in r.headers['X-Frame-Shape'].split(','))
+            return np.frombuffer(r.read(), dtype=np.uint8).reshape(shape)
+
+    def stream(self, thumb=False):
+        """(idx, RGB 배열) 을 끝없이 yield"""
+        with self._req('/stream' + ('?thumb=1' if thumb else '')) as r:
+            while True:
+                head = r.read(STREAM_HEADER.size)
+                if len(head) < STREAM_HEADER.size: return
+                idx, h, w, c = STREAM_HEADER.unpack(head)
+                if idx < 0: continue
+                yield idx, np.frombuffer(r.read(h * w * c), dtype=np.uint8).reshape(h, w, c)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -519,8 +2223,9 @@ class App:
     GOLD  = '#FFD700'
     TEXT  = '#e4e4f0'
     MUTED = '#5a5a72'
+    POLL_MS = 40                       # 녹화 중 화면 갱신 주기
 
-    def __init__(self):
+    def __init__(self, api_port=None, api_token=None):
         self.root = tk.Tk()
         self.root.title('FrameSnap')
         self.root.geometry('1280x820')
@@ -532,18 +2237,42 @@ class App:
         self.region:     dict | None             = None
         self.fps_var     = tk.IntVar(value=5)
         self.delay_var   = tk.BooleanVar(value=True)
+        self.proc_var    = tk.BooleanVar(value=False)
+        self.replay_sec  = tk.IntVar(value=30)
+        self.replay: ReplayBuffer | None = None
+        self._replay_mode = False
+        self._hotkey: GlobalHotkey | None = None
+        self.export_fmt   = ExportFormat()
+        self.filter_chain = FilterChain()
+        self.filter_mode  = tk.StringVar(value='off')   # off / capture / export
+        self._filter_stage: FilterStage | None = None
         self.auto_folder = tk.StringVar(value='')
 
         self.frames:    list = []
-        self.bookmarks: set  = set()   # FramePicker와 공유
+        self.bookmarks       = BookmarkSet(on_change=self._schedule_heat)   # FramePicker와 공유, 바뀌면 눈금 갱신
+        self.activity        = ActivityIndex()
+        self._heat_ref       = None
+        self._heat_after     = None
+        self.thumb_cache: dict = {}    # FramePicker 썸네일 캐시 (재오픈 시 재사용)
+        self._frame_listeners  = []
         self._ref            = None
         self.idx             = 0
         self.playing         = False
         self.speed           = 1.0
         self._after_id       = None
         self.screenshot_count = 0
+        self._latest         = None    # 캡처 스레드가 마지막으로 넘긴 프레임 번호
+        self._shown          = 0       # _poll_frames 가 마지막으로 반영한 프레임 수
 
         self._build()
+        self._poll_frames()
+        self.api: ControlServer | None = None
+        if api_port is not None:
+            self.api = ControlServer(self, api_port, api_token)
+            self.api.start()
+            print(f'FrameSnap API: http://127.0.0.1:{self.api.port}  {TOKEN_HEADER}: {self.api.token}',
+                  flush=True)
+            self.status_var.set(f'자동화 API  →  http://127.0.0.1:{self.api.port}  |  토큰 {self.api.token}')
         if not MSS_AVAILABLE:
             messagebox.showerror('패키지 누락', 'pip install mss 후 다시 실행하세요.')
 
@@ -572,16 +2301,33 @@ class App:
                    bg='#252530', fg=self.TEXT, insertbackground=self.TEXT,
                    relief='flat', font=('Consolas', 12), justify='center',
                    buttonbackground='#252530').pack(side='left', padx=5)
+        tk.Label(fps_f, text='리플레이(초)', bg=self.PANEL, fg=self.MUTED,
+                 font=('Consolas', 9)).pack(side='left', padx=(8,0))
+        tk.Spinbox(fps_f, from_=5, to=600, increment=5, textvariable=self.replay_sec, width=4,
+                   bg='#252530', fg=self.TEXT, insertbackground=self.TEXT,
+                   relief='flat', font=('Consolas', 12), justify='center',
+                   buttonbackground='#252530').pack(side='left', padx=5)
 
         tk.Checkbutton(bar, text='3초 후 시작', variable=self.delay_var,
                        bg=self.PANEL, fg=self.TEXT, selectcolor='#252530',
                        activebackground=self.PANEL, font=('맑은 고딕', 9),
                        cursor='hand2').pack(side='left', padx=10)
+        tk.Checkbutton(bar, text='별도 프로세스 캡처', variable=self.proc_var,
+                       bg=self.PANEL, fg=self.TEXT, selectcolor='#252530',
+                       activebackground=self.PANEL, font=('맑은 고딕', 9),
+                       cursor='hand2').pack(side='left', padx=4)
 
         # 오른쪽: 녹화 + 초기화 + 프레임저장
         self._btn(bar, '🗑  초기화', self.clear_all).pack(side='right', padx=6, pady=10)
         self._btn(bar, '🖼  프레임 저장', self._open_picker,
                   bg='#2a2a50').pack(side='right', padx=4, pady=10)
+        self._btn(bar, '💾  형식', lambda: ExportFormatWindow(self.root, self.export_fmt, self.frames),
+                  bg='#2a2a38').pack(side='right', padx=4, pady=10)
+        self._btn(bar, '🎛  필터', lambda: FilterWindow(self.root, self.filter_chain, self.filter_mode),
+                  bg='#2a2a38').pack(side='right', padx=4, pady=10)
+        self.btn_replay = self._btn(bar, '⏪  리플레이 대기', self.start_replay,
+                                     bg='#3a3010', fg=self.GOLD)
+        self.btn_replay.pack(side='right', padx=4, pady=10)
         self.btn_start = self._btn(bar, '⏺  영역 선택 후 녹화', self.start_recording,
                                     bg=self.ACCENT, fg=self.BG)
         self.btn_start.pack(side='right', padx=4, pady=10)
@@ -609,6 +2355,10 @@ class App:
         self.progress.pack(fill='x')
         self.progress.bind('<ButtonRelease-1>', self._on_seek)
         self.progress.bind('<B1-Motion>',       self._on_seek)
+        # 활동 히트 스트립 (빨간색 = 화면 변화, 금색 선 = 책갈피)
+        self.heat = tk.Canvas(bar_f, bg=self.CARD, height=8, highlightthickness=0)
+        self.heat.pack(fill='x', pady=(2,0))
+        self.heat.bind('<Configure>', lambda e: self._schedule_heat())
 
         # 프레임 번호 / 스크린샷 카운트
         info_f = tk.Frame(self.root, bg=self.BG)
@@ -661,6 +2411,18 @@ class App:
                       font=('Consolas', 12), padx=8, pady=4,
                       cursor='hand2', bd=0).pack(side='left', padx=2)
 
+        # 변화 / 책갈피 이동
+        jump_f = tk.Frame(ctrl, bg=self.PANEL)
+        jump_f.pack(side='left', padx=6, pady=6)
+        for txt, cmd, fg in [('⇤ 변화', lambda: self._jump_change(-1), self.RED),
+                              ('변화 ⇥', lambda: self._jump_change(1),  self.RED),
+                              ('⇤ 🔖',  lambda: self._jump_bookmark(-1), self.GOLD),
+                              ('🔖 ⇥',  lambda: self._jump_bookmark(1),  self.GOLD)]:
+            tk.Button(jump_f, text=txt, command=cmd,
+                      bg='#2a2a38', fg=fg, relief='flat',
+                      font=('맑은 고딕', 8, 'bold'), padx=6, pady=4,
+                      cursor='hand2', bd=0).pack(side='left', padx=2)
+
         # 저장폴더 + 📸 스크린샷
         right_f = tk.Frame(ctrl, bg=self.PANEL)
         right_f.pack(side='right', padx=10, pady=6)
@@ -690,6 +2452,11 @@ class App:
         self.root.bind('<Right>', lambda e: self._step(1))
         self.root.bind('<s>',     lambda e: self._take_screenshot())
         self.root.bind('<S>',     lambda e: self._take_screenshot())
+        self.root.bind('<F9>',    lambda e: self.commit_replay())
+        self.root.bind('<bracketleft>',  lambda e: self._jump_change(-1))
+        self.root.bind('<bracketright>', lambda e: self._jump_change(1))
+        self.root.bind('<comma>',  lambda e: self._jump_bookmark(-1))
+        self.root.bind('<period>', lambda e: self._jump_bookmark(1))
 
         # 초기 안내 이미지
         self._draw_empty()
@@ -772,6 +2539,36 @@ class App:
     def _jump_end(self):
         self._jump(len(self.frames)-1)
 
+    def _jump_change(self, d):
+        if not self.frames: return
+        i = self.activity.next_change(self.idx) if d > 0 else self.activity.prev_change(self.idx)
+        if i is not None: self._jump(i)
+
+    def _jump_bookmark(self, d):
+        if not self.frames: return
+        i = self.bookmarks.next_after(self.idx) if d > 0 else self.bookmarks.prev_before(self.idx)
+        if i is not None: self._jump(i)
+
+    def _schedule_heat(self):
+        if self._heat_after is None:
+            self._heat_after = self.root.after(300, self._draw_heat)
+
+    def _draw_heat(self):
+        self._heat_after = None
+        w, h = max(self.heat.winfo_width(), 1), int(self.heat['height'])
+        self.heat.delete('all')
+        n = min(self.activity.n, len(self.frames))
+        if n == 0: return
+        v = self.activity.heat(w, n)[:, None]
+        lo, hi = np.array([31, 31, 41], np.float32), np.array([255, 78, 106], np.float32)
+        row = (lo + (hi - lo) * v).astype(np.uint8)
+        self._heat_ref = ImageTk.PhotoImage(Image.fromarray(np.repeat(row[None], h, axis=0)))
+        self.heat.create_image(0, 0, image=self._heat_ref, anchor='nw')
+        for b in self.bookmarks.order:
+            if b < n:
+                x = b * (w - 1) // max(n - 1, 1)
+                self.heat.create_line(x, 0, x, h, fill=self.GOLD)
+
     def _on_seek(self, event=None):
         try:
             self.idx = int(self.progress.get())
@@ -790,8 +2587,8 @@ class App:
             if not folder: return
             self.auto_folder.set(folder)
         self.screenshot_count += 1
-        path = os.path.join(folder, f'screenshot_{self.screenshot_count:04d}_f{self.idx+1}.png')
-        Image.fromarray(self.frames[self.idx]).save(path)
+        path = self.export_fmt.save(self.frames[self.idx],
+                                    os.path.join(folder, f'screenshot_{self.screenshot_count:04d}_f{self.idx+1}'))
         self.canvas.configure(bg='white')
         self.root.after(80, lambda: self.canvas.configure(bg='#080810'))
         self.shot_lbl.config(text=f'📸 스크린샷 {self.screenshot_count}장 저장됨')
@@ -803,16 +2600,30 @@ class App:
 
     # ── 프레임 저장 팝업
     def _open_picker(self):
-        if not self.frames:
+        if not self.frames and not self.recorder:
             messagebox.showwarning('알림', '먼저 녹화를 진행하세요.')
             return
-        FramePickerWindow(self.root, self.frames, self.bookmarks)
+        FramePickerWindow(self.root, self.frames, self.bookmarks, self._export_chain,
+                          self.thumb_cache, self.subscribe_frames, self.export_fmt)
+
+    def subscribe_frames(self, fn):
+        """프레임 수 변경 알림 구독 – UI 스레드에서 fn(프레임 수) 호출. 해제 함수 반환"""
+        self._frame_listeners.append(fn)
+        return lambda: fn in self._frame_listeners and self._frame_listeners.remove(fn)
+
+    def _notify_frames(self):
+        for fn in list(self._frame_listeners): fn(len(self.frames))
+
+    def _export_chain(self):
+        if self.filter_mode.get() == 'export' and self.filter_chain: return self.filter_chain
+        return None
 
     # ── 녹화
-    def start_recording(self):
+    def start_recording(self, replay=False):
         if not MSS_AVAILABLE:
             messagebox.showerror('오류', 'pip install mss 후 재실행하세요.')
             return
+        self._replay_mode = replay
         self.root.iconify()
         # 창이 완전히 최소화될 때까지 대기 후 선택 오버레이 열기 (1번 버그 수정)
         self.root.after(400, lambda: RegionSelector(self._on_region))
@@ -822,45 +2633,142 @@ class App:
         if region is None: return
         self.region = region
         self.btn_start.config(state='disabled')
-        if self.delay_var.get():
+        self.btn_replay.config(state='disabled')
+        if self.delay_var.get() and not self._replay_mode:
             self.status_var.set('3초 후 녹화 시작...')
             Countdown(region, self._begin_recording)
         else:
             self._begin_recording()
 
-    def _begin_recording(self):
+    def start_recording_region(self, region, fps=None, source=None):
+        """영역 선택/카운트다운 없이 바로 녹화 (자동화 API용)"""
+        if self.recorder: raise RuntimeError('이미 녹화 중입니다.')
+        if source is None and not MSS_AVAILABLE: raise RuntimeError('mss 패키지가 없습니다.')
+        if fps: self.fps_var.set(int(fps))
+        self.region = region
+        self._replay_mode = False
+        self.btn_start.config(state='disabled')
+        self.btn_replay.config(state='disabled')
+        self._begin_recording(source)
+
+    def _begin_recording(self, source=None):
         r = self.region
-        self.float_ctrl = FloatingControls(r, self.stop_recording)
-        self.recorder   = Recorder(r, self.fps_var.get(), self._on_frame,
-                                    lambda: self.float_ctrl.paused if self.float_ctrl else False)
-        self.status_var.set(f'🔴 녹화 중  –  {r["width"]}×{r["height"]}  |  {self.fps_var.get()} FPS')
+        on_frame = self._on_frame
+        if self._replay_mode:
+            self.replay = ReplayBuffer(self.replay_sec.get(), self.fps_var.get())
+            on_frame = self.replay.push
+            # 녹화 대상 앱에 포커스가 있어도 F9 가 먹도록 (Windows). 그 외엔 root 바인딩 / 💾 버튼
+            self._hotkey = GlobalHotkey(0x78, lambda: self.root.after(0, self.commit_replay))   # VK_F9
+        self.float_ctrl = FloatingControls(r, self.stop_recording,
+                                           self.commit_replay if self.replay else None)
+        if self.filter_mode.get() == 'capture' and self.filter_chain:
+            self.filter_chain.reset_stats()
+            self._filter_stage = FilterStage(self.filter_chain, on_frame)
+            on_frame = self._filter_stage.push
+        rec_cls = ProcessRecorder if self.proc_var.get() else Recorder
+        self.recorder   = rec_cls(r, self.fps_var.get(), on_frame,
+                                   lambda: self.float_ctrl.paused if self.float_ctrl else False,
+                                   source)
+        if self.replay:
+            self.status_var.set(f'⏪ 리플레이 대기 중  –  최근 {self.replay_sec.get()}초 보관  |  F9 / 💾 버튼으로 저장')
+        else:
+            self.status_var.set(f'🔴 녹화 중  –  {r["width"]}×{r["height"]}  |  {self.fps_var.get()} FPS')
         # 진행바 범위 업데이트
         self.progress.configure(to=1)
         self.recorder.start()
 
     def stop_recording(self):
+        dropped, failed = 0, 0
         if self.recorder:
             self.recorder.stop()
+            dropped = self.recorder.dropped
             self.recorder = None
+        if self._filter_stage:
+            self._filter_stage.close()      # 남은 배치까지 처리한 뒤 반환, 이후 프레임은 버림
+            dropped += self._filter_stage.dropped
+            failed = self._filter_stage.errors
+            self._filter_stage = None
         if self.float_ctrl:
             self.float_ctrl.destroy()
             self.float_ctrl = None
         self.btn_start.config(state='normal')
+        self.btn_replay.config(state='normal')
+        self.replay = None
+        if self._hotkey:
+            self._hotkey.close()
+            self._hotkey = None
         total = len(self.frames)
         if total > 1:
             self.progress.configure(to=total-1)
-        self.status_var.set(f'녹화 완료  –  총 {total}개 프레임  |  재생 버튼을 누르세요')
+        self._schedule_heat()
+        note = f'  |  ⚠️ 처리가 밀려 버린 프레임 {dropped}개' if dropped else ''
+        if failed: note += f'  |  ⚠️ 필터 오류로 버린 프레임 {failed}개'
+        self.status_var.set(f'녹화 완료  –  총 {total}개 프레임{note}  |  재생 버튼을 누르세요')
+        if failed:
+            messagebox.showwarning('필터 오류', f'필터가 실패한 프레임 {failed}개는 저장하지 않았습니다.\n\n'
+                                               f'{self.filter_chain.last_error}')
+
+    # ── 리플레이 버퍼
+    def start_replay(self):
+        self.start_recording(replay=True)
+
+    def commit_replay(self):
+        """버퍼의 최근 N초를 세션에 추가 – 복사는 별도 스레드에서 (캡처 스레드는 계속 진행)"""
+        buf = self.replay
+        if not buf: return
+        self.status_var.set('⏪ 리플레이 저장 중...')
+        threading.Thread(target=lambda: self.root.after(0, self._on_replay_committed, buf.take()),
+                         daemon=True).start()
+
+    def _on_replay_committed(self, frames):
+        if not frames:
+            self.status_var.set('⏪ 지난 저장 이후 새로 쌓인 프레임이 없습니다')
+            return
+        start = len(self.frames)
+        for rgb in frames: self.activity.add(rgb)
+        self.frames.extend(frames)
+        self._shown = len(self.frames)      # UI 스레드에서 직접 반영함
+        self.bookmarks.add(start)           # 리플레이 구간 시작을 책갈피로 표시
+        self.progress.configure(to=max(len(self.frames) - 1, 1))
+        self.cnt_var.set(f'프레임 {len(self.frames)}')
+        self.idx = start
+        self._show_frame()
+        self._schedule_heat()
+        self._notify_frames()
+        self.status_var.set(f'⏪ 리플레이 {len(frames)}프레임 추가됨  (#{start+1}부터, 🔖 표시)')
 
     def _on_frame(self, rgb, idx):
+        """캡처/필터 스레드에서 호출 – Tk 는 건드리지 않음 (화면 갱신은 _poll_frames)"""
+        self.activity.add(rgb)
         self.frames.append(rgb)
-        self.root.after(0, self._on_frame_ui, idx)
+        if self.api: self.api.publish(len(self.frames) - 1, rgb)
+        self._latest = idx
+
+    def _poll_frames(self):
+        # stop_recording 이 캡처 스레드를 join 하므로, 그 스레드가 Tk 호출로 막히지 않게 UI 쪽에서 당겨옴
+        if len(self.frames) != self._shown:
+            self._shown = len(self.frames)
+            if self._latest is not None: self._on_frame_ui(self._latest)
+        rec = self.recorder
+        if rec is not None and rec.error:       # 캡처 스레드/프로세스가 죽음 → 녹화 중 표시를 남기지 않음
+            self.stop_recording()
+            self.status_var.set(f'⚠️ 캡처 오류로 녹화 중지  –  {rec.error}')
+            messagebox.showerror('캡처 오류', f'녹화를 중지했습니다.\n\n{rec.error}')
+        self.root.after(self.POLL_MS, self._poll_frames)
 
     def _on_frame_ui(self, idx):
         self.cnt_var.set(f'프레임 {len(self.frames)}')
+        self._schedule_heat()
+        self._notify_frames()
         # 녹화 중 최신 프레임 실시간 표시
         self.idx = idx
         self._show_frame()
 
+    def set_bookmark(self, idx, on=True):
+        if not 0 <= idx < len(self.frames): raise ValueError(f'프레임 #{idx} 없음')
+        if on: self.bookmarks.add(idx)
+        else:  self.bookmarks.discard(idx)
+
     # ── 초기화
     def clear_all(self):
         if self.frames and not messagebox.askyesno('초기화', '모든 프레임을 삭제할까요?'):
@@ -868,7 +2776,12 @@ class App:
         if self.recorder: self.stop_recording()
         if self.playing: self._toggle_play()
         self.frames.clear()
+        self._shown, self._latest = 0, None
         self.bookmarks.clear()
+        self.activity.clear()
+        self.thumb_cache.clear()
+        self._notify_frames()
+        self._schedule_heat()
         self.idx = 0
         self.screenshot_count = 0
         self._ref = None
@@ -885,4 +2798,11 @@ class App:
 
 
 if __name__ == '__main__':
-    App().run()
+    mp.freeze_support()     # PyInstaller onefile 에서 캡처 프로세스 실행용
+    ap = argparse.ArgumentParser(description='FrameSnap')
+    ap.add_argument('--api', type=int, nargs='?', const=8765, metavar='PORT',
+                    help='자동화용 로컬 제어 API 실행 (기본 포트 8765)')
+    ap.add_argument('--api-token', metavar='TOKEN',
+                    help=f'API 토큰 ({TOKEN_HEADER} 헤더) 지정 – 생략하면 실행 때마다 무작위로 만들어 출력')
+    args = ap.parse_args()
+    App(api_port=args.api, api_token=args.api_token).run()
@@ -0,0 +1,29 @@
+"""BookmarkSet – 어떤 방식으로 바꿔도 정렬 목록·변경 알림이 따라와야 함"""
+import pytest
+
+import framesnap as fs
+
+
+def test_order_follows_every_mutation():
+    calls = []
+    b = fs.BookmarkSet([5, 1], on_change=lambda: calls.append(1))
+    b |= {9, 3}
+    b.update([7])
+    b.remove(1)
+    b -= {3}
+    b &= {5, 7, 9, 100}
+    b ^= {5, 42}
+    b.difference_update([9])
+    b.symmetric_difference_update([0])
+    b.pop()
+    assert isinstance(b, fs.BookmarkSet)
+    assert b.order == sorted(b)
+    assert len(calls) == 9
+    with pytest.raises(KeyError):
+        b.remove(1000)
+
+
+def test_navigation():
+    b = fs.BookmarkSet([10, 3, 7])
+    assert b.next_after(3) == 7 and b.next_after(10) is None
+    assert b.prev_before(7) == 3 and b.prev_before(3) is None
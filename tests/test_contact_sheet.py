@@ -0,0 +1,44 @@
+"""콘택트 시트 – 시트 분할, 썸네일 캐시 사용 조건"""
+import os
+
+import numpy as np
+from PIL import Image
+
+import framesnap as fs
+
+
+def _frames(n): return [np.full((720, 1280, 3), 200, np.uint8) for _ in range(n)]
+
+
+def _thumbs(frames):
+    # 프레임 선택 창과 같은 (원본, 썸네일) 쌍 – 원본과 구별되게 다른 색
+    return {i: (f, np.full((90, 160, 3), 7, np.uint8)) for i, f in enumerate(frames)}
+
+
+def test_splits_into_sheets_and_reports_progress(tmp_path):
+    frames, seen = _frames(13), []
+    paths = fs.save_contact_sheets(frames, range(13), str(tmp_path), cols=3, rows=2,
+                                   progress=lambda d, n: seen.append((d, n)))
+    assert len(paths) == 3 and sorted(os.listdir(tmp_path)) == [os.path.basename(p) for p in paths]
+    assert seen == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_default_cell_uses_cached_thumbnails(tmp_path):
+    frames = _frames(4)
+    path, = fs.save_contact_sheets(frames, range(4), str(tmp_path), cols=2, labels=False,
+                                   thumbs=_thumbs(frames))
+    sheet = np.asarray(Image.open(path))
+    assert (sheet == 7).all(axis=2).sum() == 4 * 90 * 160
+
+
+def test_larger_cell_or_stale_cache_uses_original(tmp_path):
+    frames = _frames(2)
+    thumbs = _thumbs(frames)
+    path, = fs.save_contact_sheets(frames, range(2), str(tmp_path), cell=(320, 180), labels=False,
+                                   thumbs=thumbs)
+    assert not (np.asarray(Image.open(path)) == 7).all(axis=2).any()
+    thumbs[0] = (frames[1], thumbs[0][1])                  # 다른 프레임의 썸네일 → 무시
+    sub = tmp_path / 'stale'
+    sub.mkdir()
+    path, = fs.save_contact_sheets(frames, [0], str(sub), labels=False, thumbs=thumbs)
+    assert not (np.asarray(Image.open(path)) == 7).all(axis=2).any()
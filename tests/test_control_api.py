@@ -0,0 +1,156 @@
+"""ControlServer ↔ ControlClient 왕복 테스트 (Tk 없이 최소 앱 스텁 + SyntheticScreen)"""
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import framesnap as fs
+
+
+class _Root:
+    """Tk 메인 루프 대신 타이머 스레드로 after 콜백 실행"""
+
+    def after(self, ms, fn, *args):
+        threading.Timer(ms / 1000, fn, args).start()
+
+
+class StubApp:
+    def __init__(self):
+        self.root       = _Root()
+        self.frames     = []
+        self.bookmarks  = fs.BookmarkSet()
+        self.recorder   = None
+        self.api        = None
+        self.export_fmt = fs.ExportFormat()
+        self.chain      = None
+
+    def _export_chain(self):
+        return self.chain
+
+    def start_recording_region(self, region, fps=None, source=None):
+        if self.recorder: raise RuntimeError('이미 녹화 중입니다.')
+        self.recorder = fs.Recorder(region, fps or 10, self._on_frame, lambda: False, source)
+        self.recorder.start()
+
+    def stop_recording(self):
+        if self.recorder: self.recorder.stop()
+        self.recorder = None
+
+    def _on_frame(self, rgb, idx):
+        self.frames.append(rgb)
+        if self.api: self.api.publish(len(self.frames) - 1, rgb)
+
+    def set_bookmark(self, idx, on=True):
+        if not 0 <= idx < len(self.frames): raise ValueError(f'프레임 #{idx} 없음')
+        if on: self.bookmarks.add(idx)
+        else:  self.bookmarks.discard(idx)
+
+
+@pytest.fixture
+def api():
+    app = StubApp()
+    srv = fs.ControlServer(app, 0)
+    app.api = srv
+    srv.start()
+    yield app, fs.ControlClient(srv.port, srv.token)
+    app.stop_recording()
+    srv.stop()
+
+
+def test_record_stream_bookmark_export(api, tmp_path):
+    app, client = api
+    region = {'top': 0, 'left': 0, 'width': 160, 'height': 120}
+
+    st = client.start(region, fps=20, synthetic=True)
+    assert st['recording'] and st['fps'] == 20
+
+    seen = []
+    for idx, rgb in client.stream():
+        assert rgb.shape == (120, 160, 3)
+        seen.append(idx)
+        if len(seen) == 3: break
+    assert seen == sorted(seen)
+
+    assert client.bookmark(seen[0])['bookmarks'] == 1
+    with pytest.raises(urllib.error.HTTPError) as e:
+        client.bookmark(10 ** 6)
+    assert e.value.code == 400
+
+    st = client.stop()
+    assert not st['recording'] and st['frames'] >= 3
+    time.sleep(0.2)                             # 녹화 스레드의 마지막 프레임
+
+    full = client.frame(seen[0])
+    assert np.array_equal(full, app.frames[seen[0]])
+    thumb = client.frame(seen[0], thumb=True)
+    assert max(thumb.shape[:2]) <= fs.ControlServer.THUMB_MAX
+
+    res = client.call('/export', folder=str(tmp_path), bookmarks=True)
+    assert res['saved'] == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_export_applies_save_filters(api, tmp_path):
+    app, client = api
+    app.frames.append(np.full((40, 60, 3), 200, np.uint8))
+    app.chain = fs.FilterChain([fs.RedactFilter(0, 0, 60, 40)])
+    assert client.call('/export', folder=str(tmp_path))['saved'] == 1
+    saved = np.asarray(Image.open(tmp_path / os.listdir(tmp_path)[0]))
+    assert not saved.any()
+
+
+def _raw(app_client, method, path, headers, body=b''):
+    app, client = app_client
+    port = int(client.base.rsplit(':', 1)[1])
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.putrequest(method, path, skip_host=True)
+    for k, v in headers.items(): conn.putheader(k, v)
+    conn.putheader('Content-Length', str(len(body)))
+    conn.endheaders(body)
+    res = conn.getresponse()
+    res.read()
+    conn.close()
+    return res.status, app
+
+
+@pytest.mark.parametrize('bad', [
+    {'Content-Type': 'text/plain'},                     # 브라우저 단순 요청
+    {'Host': 'evil.example'},                           # DNS 리바인딩
+    {'Origin': 'http://evil.example'},                  # 교차 사이트
+    {'X-FrameSnap-Token': 'wrong'},
+])
+def test_foreign_requests_are_rejected(api, bad):
+    app, client = api
+    port = int(client.base.rsplit(':', 1)[1])
+    headers = {'Host': f'127.0.0.1:{port}', 'Content-Type': 'application/json',
+               'X-FrameSnap-Token': client.token, **bad}
+    body = json.dumps({'region': {'top': 0, 'left': 0, 'width': 64, 'height': 48},
+                       'synthetic': True}).encode()
+    status, app = _raw(api, 'POST', '/record/start', headers, body)
+    assert 400 <= status < 500
+    assert app.recorder is None
+    status, _ = _raw(api, 'GET', '/status', {k: v for k, v in headers.items() if k != 'Content-Type'})
+    assert status == 200 if 'Content-Type' in bad else 400 <= status < 500
+
+
+def test_localhost_host_is_accepted(api):
+    _, client = api
+    port = int(client.base.rsplit(':', 1)[1])
+    status, _ = _raw(api, 'GET', '/status', {'Host': f'localhost:{port}',
+                                             'X-FrameSnap-Token': client.token})
+    assert status == 200
+
+
+def test_double_start_is_rejected(api):
+    _, client = api
+    region = {'top': 0, 'left': 0, 'width': 64, 'height': 48}
+    client.start(region, fps=10, synthetic=True)
+    with pytest.raises(urllib.error.HTTPError) as e:
+        client.start(region, synthetic=True)
+    assert e.value.code == 400
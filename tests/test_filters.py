@@ -0,0 +1,60 @@
+"""FilterStage – 순서 보장, 실패 배치 처리, 대기열 상한"""
+import threading
+
+import numpy as np
+
+import framesnap as fs
+
+
+class Boom(fs.FrameFilter):
+    name = '고장'
+
+    def apply(self, batch, meta):
+        raise RuntimeError('broken')
+
+
+class Slow(fs.FrameFilter):
+    name = '느림'
+
+    def __init__(self): self.gate = threading.Event()
+
+    def apply(self, batch, meta):
+        self.gate.wait(5)
+        return batch
+
+
+def _frames(n): return [np.full((20, 30, 3), i, np.uint8) for i in range(n)]
+
+
+def test_results_arrive_in_order_and_close_drains():
+    got = []
+    stage = fs.FilterStage(fs.FilterChain([fs.GrayscaleFilter()]), lambda rgb, i: got.append(i))
+    for i, f in enumerate(_frames(23)): stage.push(f, i)
+    stage.close()
+    assert got == list(range(23))
+    stage.push(_frames(1)[0], 99)               # 닫은 뒤엔 무시
+    assert got == list(range(23))
+
+
+def test_failed_batches_are_not_saved_and_are_reported():
+    chain = fs.FilterChain([fs.RedactFilter(0, 0, 10, 10), Boom()])
+    got = []
+    stage = fs.FilterStage(chain, lambda rgb, i: got.append(i))
+    for i, f in enumerate(_frames(8)): stage.push(f, i)
+    stage.close()
+    assert got == []
+    assert stage.errors == 8 and chain.failed == 8
+    assert '8' in chain.report() and 'broken' in chain.report()
+    chain.reset_stats()
+    assert chain.failed == 0 and chain.report() == ''
+
+
+def test_backlog_is_bounded():
+    slow = Slow()
+    got = []
+    stage = fs.FilterStage(fs.FilterChain([slow]), lambda rgb, i: got.append(i), max_pending=10)
+    for i, f in enumerate(_frames(50)): stage.push(f, i)
+    assert stage.dropped == 40
+    slow.gate.set()
+    stage.close()
+    assert got == list(range(10))
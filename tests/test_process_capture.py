@@ -0,0 +1,56 @@
+"""ProcessRecorder – 별도 프로세스 캡처가 프레임을 넘기고, 멈춘 뒤 공유메모리를 정리하는지"""
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+import framesnap as fs
+
+REGION = {'top': 0, 'left': 0, 'width': 160, 'height': 120}
+
+
+class BrokenScreen(fs.SyntheticScreen):
+    def grab(self, region):
+        raise OSError('화면 없음')
+
+
+def _record(source, seconds, fps=30):
+    got = []
+    rec = fs.ProcessRecorder(REGION, fps, lambda rgb, i: got.append((i, rgb.shape)),
+                             lambda: False, source)
+    rec.start()
+    deadline = time.time() + seconds
+    while time.time() < deadline and rec.running: time.sleep(0.05)
+    name = rec.ring.name
+    rec.stop()
+    return rec, got, name
+
+
+def _unlinked(name):
+    try: shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError: return True
+    return False
+
+
+def test_records_and_releases_shared_memory():
+    rec, got, name = _record(fs.SyntheticScreen, 1.5)
+    assert rec.error is None
+    assert len(got) >= 10
+    assert [i for i, _ in got] == list(range(len(got)))
+    assert all(shape == (120, 160, 3) for _, shape in got)
+    assert not rec._proc.is_alive()
+    assert _unlinked(name)
+
+
+def test_child_error_is_reported():
+    rec, got, name = _record(BrokenScreen, 10)
+    assert not got
+    assert rec.error and 'OSError' in rec.error
+    assert _unlinked(name)
+
+
+def test_thread_recorder_reports_error():
+    rec = fs.Recorder(REGION, 30, lambda rgb, i: None, lambda: False, BrokenScreen)
+    rec.start()
+    rec._thread.join(2)
+    assert rec.error and '화면 없음' in rec.error
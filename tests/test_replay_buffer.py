@@ -0,0 +1,48 @@
+"""ReplayBuffer – 메모리 상한, 순서, 연속 저장 시 겹침 없음"""
+import numpy as np
+import pytest
+
+import framesnap as fs
+
+
+def _frame(i, h=1080, w=1920):
+    return np.full((h, w, 3), i % 256, np.uint8)
+
+
+@pytest.mark.parametrize('seconds, fps', [(10, 5), (30, 5), (120, 30), (600, 30)])
+def test_memory_stays_within_budget(seconds, fps):
+    buf = fs.ReplayBuffer(seconds, fps)
+    buf.push(_frame(0))
+    assert buf.nbytes <= fs.ReplayBuffer.BUDGET
+    assert buf.slots == seconds * fps
+
+
+def test_small_buffer_keeps_full_resolution():
+    buf = fs.ReplayBuffer(1, 2, budget=10 * 120 * 160 * 3)
+    buf.push(_frame(0, 120, 160))
+    assert buf.step == 1
+
+
+def test_keeps_last_slots_in_order_at_full_size():
+    buf = fs.ReplayBuffer(2, 5, budget=4 * 1024 ** 2)       # 10 슬롯, 축소 보관
+    for i in range(27): buf.push(_frame(i, 360, 640))
+    assert buf.step > 1
+    frames, last = buf.snapshot()
+    assert last == 26
+    assert [int(f[0, 0, 0]) for f in frames] == list(range(17, 27))
+    assert all(f.shape == (360, 640, 3) for f in frames)
+
+
+def test_take_returns_only_new_frames():
+    buf = fs.ReplayBuffer(2, 5, budget=16 * 1024 ** 2)
+    for i in range(6): buf.push(_frame(i, 48, 64))
+    assert [int(f[0, 0, 0]) for f in buf.take()] == list(range(6))
+    assert buf.take() == []
+    for i in range(6, 9): buf.push(_frame(i, 48, 64))
+    assert [int(f[0, 0, 0]) for f in buf.take()] == [6, 7, 8]
+    for i in range(9, 40): buf.push(_frame(i, 48, 64))     # 한 바퀴 넘게 돎
+    assert [int(f[0, 0, 0]) for f in buf.take()] == list(range(30, 40))
+
+
+def test_empty_buffer():
+    assert fs.ReplayBuffer(1, 1).take() == []
@@ -0,0 +1,48 @@
+"""스크롤 이어붙이기 – 원본 페이지를 바이트 단위로 복원하고, 위로 스크롤한 프레임은 건너뜀"""
+import numpy as np
+import pytest
+from PIL import Image
+
+import framesnap as fs
+
+
+def _page(rng, h, w):
+    page = (rng.integers(0, 256, (h, 1, 3)) * np.ones((1, w, 1))).astype(np.uint8)
+    page[:, ::7] = rng.integers(0, 256, (h, len(range(0, w, 7)), 3))
+    return page
+
+
+def test_restores_page_and_skips_upward_scroll(tmp_path):
+    page   = _page(np.random.default_rng(0), 3000, 400)
+    tops   = [0, 120, 260, 400, 100, 520, 700]       # 100 = 위로 스크롤
+    frames = [page[y:y + 400].copy() for y in tops]
+    path   = tmp_path / 'scroll.png'
+
+    used, height, skipped = fs.stitch_scroll(frames, range(len(frames)), str(path))
+    assert (used, height, skipped) == (6, 1100, 1)
+    out = np.asarray(Image.open(path))
+    assert out.shape == (1100, 400, 3)
+    assert np.array_equal(out, page[:1100])
+
+
+def test_scroll_offset_matches_shift():
+    page = _page(np.random.default_rng(1), 600, 320)
+    prev, cur = fs._row_signature(page[:300]), fs._row_signature(page[37:337])
+    d, msd = fs._scroll_offset(prev, cur, 45)
+    assert d == 37 and msd < 1e-6
+
+
+def test_mixed_sizes_rejected_without_leaving_file(tmp_path):
+    frames = [np.zeros((100, 80, 3), np.uint8), np.zeros((50, 40, 3), np.uint8)]
+    path = tmp_path / 'bad.png'
+    with pytest.raises(ValueError):
+        fs.stitch_scroll(frames, [0, 1], str(path))
+    assert not path.exists()
+
+
+def test_png_strip_writer_roundtrip(tmp_path):
+    rgb = np.random.default_rng(2).integers(0, 256, (90, 33, 3), dtype=np.uint8)
+    w = fs.PngStripWriter(str(tmp_path / 'a.png'), 33, 90, level=1)
+    for y in range(0, 90, 25): w.write(rgb[y:y + 25])
+    w.close()
+    assert np.array_equal(np.asarray(Image.open(tmp_path / 'a.png')), rgb)
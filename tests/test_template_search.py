@@ -0,0 +1,41 @@
+"""TemplateSearch 재현율 – 패치가 축소 격자와 어긋난 위치에 있어도 모두 찾아야 함"""
+import numpy as np
+import pytest
+from PIL import Image
+
+import framesnap as fs
+
+
+def _texture(rng, h, w, grain):
+    small = rng.integers(0, 256, (max(h // grain, 1), max(w // grain, 1), 3), dtype=np.uint8)
+    return np.asarray(Image.fromarray(small).resize((w, h)))
+
+
+@pytest.mark.parametrize('grain', [1, 2, 3, 6])
+def test_finds_patch_at_every_sub_block_offset(grain):
+    rng   = np.random.default_rng(grain)
+    bg    = _texture(rng, 360, 640, 4)
+    patch = _texture(rng, 60, 120, grain)
+    search = fs.TemplateSearch(patch)
+    assert search.step == 4
+
+    frames, truth = [], {}
+    for oy in range(search.step):
+        for ox in range(search.step):
+            y, x = 100 + 41 * oy, 200 + 81 * ox     # (y % step, x % step) = (oy, ox)
+            f = bg.copy()
+            f[y:y + 60, x:x + 120] = patch
+            truth[len(frames)] = (x, y)
+            frames.append(f)
+    frames.append(bg.copy())                    # 패치 없는 프레임
+
+    hits = search.run(frames, range(len(frames)))
+    assert set(hits) == set(truth)
+    for i, (x, y) in truth.items():
+        assert hits[i][1:] == (x, y)
+        assert hits[i][0] > 0.99
+
+
+def test_flat_patch_is_rejected():
+    with pytest.raises(ValueError):
+        fs.TemplateSearch(np.full((40, 40, 3), 128, np.uint8))